@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+GitHub README Stats Benchmark
+
+Entry point for readme_stats.bench; see `--help` for the options.
+
+Example:
+    python scripts/bench_readme_stats.py --repos 10 100 1000 --latency-ms 20
+"""
+
+import sys
+
+from readme_stats.bench import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+"""
+GitHub README Stats Generator
+
+Fetches GitHub data using REST and GraphQL APIs and generates SVG files
+for display in README.md files. Run it with `python -m readme_stats`
+(or scripts/generate_readme_stats.py); see readme_stats.cli for the
+subcommands.
+"""
@@ -0,0 +1,112 @@
+"""Batch mode: cards for many users in one run."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .bulk import render_datasets
+from .cards import write_user_cards
+from .config import BATCH_WORKERS, SHARD_RETRIES
+from .dataset import fetch_user_dataset
+from .ratelimit import rate_budget
+from .shard import get_status_path, is_complete, select_shard
+from .storage import save_state
+
+
+def run_batch(usernames, token, output_root, workers=None, render_workers=None, sources=None):
+    """Generate cards for several users, writing to output_root/<username>/.
+
+    Users are processed concurrently but share one connection pool, the
+    global in-flight request cap and the rate limit budget. With
+    `render_workers` set, fetched datasets are rendered by
+    render_datasets() in that many processes (0 for RENDER_WORKERS).
+    If `sources` is a dict, each fetched user's dataset["sources"] is
+    stored in it.
+    """
+    if workers is None:
+        workers = BATCH_WORKERS
+    workers = max(1, min(workers, len(usernames)))
+
+    def run_user(username):
+        dataset = fetch_user(username)
+        if dataset is None:
+            return 0
+        try:
+            return write_user_cards(dataset, os.path.join(output_root, username))
+        except Exception as e:
+            print(f"Error generating cards for {username}: {e}")
+            return 0
+
+    def fetch_user(username):
+        try:
+            dataset = fetch_user_dataset(username, token)
+        except Exception as e:
+            print(f"Error fetching data for {username}: {e}")
+            return None
+        if sources is not None:
+            sources[username] = dataset["sources"]
+        return dataset
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        if render_workers is None:
+            results = dict(zip(usernames, executor.map(run_user, usernames)))
+        else:
+            datasets = (dataset for dataset in executor.map(fetch_user, usernames) if dataset)
+            rendered = render_datasets(datasets, output_root, render_workers, total=len(usernames))
+            results = {username: rendered.get(username, 0) for username in usernames}
+
+    print(f"\nBatch complete: {len(results)} users")
+    for username, count in results.items():
+        print(f"  {username}: {count}/3 SVGs")
+    return results
+
+
+def run_shard(usernames, token, output_root, shard, manifest=None, workers=None,
+              render_workers=None, retries=None):
+    """Run shard (index, count) of a sharded batch and write its status file.
+
+    Only the users select_shard() assigns to this shard are processed,
+    through run_batch(). Users whose cards were not all built from live
+    data are run again, up to `retries` (SHARD_RETRIES) more times. The
+    status file records each user's cards, data sources and attempts and
+    this worker's rate limit state, for merge_shards().
+    """
+    index, count = shard
+    if retries is None:
+        retries = SHARD_RETRIES
+    users = select_shard(usernames, index, count, manifest)
+    status_path = get_status_path(output_root, index, count)
+    status = {
+        "shard": index,
+        "shards": count,
+        "state": "running",
+        "started_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+        "users": {name: {"attempts": 0, "cards": 0, "sources": {}} for name in users},
+    }
+    save_state(status_path, status)
+    print(f"Shard {index}/{count}: {len(users)} of {len(usernames)} users")
+
+    pending = users
+    for attempt in range(1, retries + 2):
+        if not pending:
+            break
+        if attempt > 1:
+            print(f"\nShard {index}/{count}: retrying {len(pending)} users (attempt {attempt})")
+        sources = {}
+        results = run_batch(pending, token, output_root, workers, render_workers, sources)
+        for name in pending:
+            status["users"][name].update(
+                attempts=attempt, cards=results.get(name, 0), sources=sources.get(name, {})
+            )
+        pending = [name for name in pending if not is_complete(status["users"][name])]
+
+    status.update(
+        state="done",
+        finished_at=datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+        failed=pending,
+        rate_limit=rate_budget.limits(),
+        adaptations=rate_budget.summary(),
+    )
+    save_state(status_path, status)
+    print(f"Shard {index}/{count}: {len(users) - len(pending)}/{len(users)} users complete")
+    return {name: entry["cards"] for name, entry in status["users"].items()}
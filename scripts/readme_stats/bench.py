@@ -0,0 +1,639 @@
+"""
+GitHub README Stats Benchmark
+
+Runs the stats generator against a local stand-in for the GitHub API that
+serves synthetic (or recorded) users, repos, languages and contribution
+calendars, and reports wall time, request count, peak RSS and per-stage
+timings.
+
+Example:
+    python scripts/bench_readme_stats.py --repos 10 100 1000 --latency-ms 20
+    python -m readme_stats bench --imports
+    python -m readme_stats bench --shards 4 --users-count 40 --repos 50
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+BENCH_LANGUAGES = [
+    ("Python", "#3572A5"),
+    ("JavaScript", "#f1e05a"),
+    ("TypeScript", "#2b7489"),
+    ("HTML", "#e34c26"),
+    ("CSS", "#563d7c"),
+    ("Go", "#00ADD8"),
+    ("Rust", "#dea584"),
+    ("Shell", "#89e051"),
+    ("Jupyter Notebook", "#DA5B0B"),
+    ("C++", "#f34b7d"),
+]
+
+STAGES = ["fetch", "aggregate", "streaks", "render"]
+
+# Directory holding the readme_stats package, for child interpreters
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Import-time budget (--imports): commands that never touch the network
+# must not load these modules, and their imports may add at most
+# IMPORT_BUDGET_MS to a bare interpreter's startup
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "50"))
+NETWORK_MODULES = ("requests", "urllib3", "asyncio", "http.server")
+IMPORT_CHECKS = {
+    "--help": ["--help"],
+    "render": ["render", "--output-dir", "{work_dir}/out", "--report", ""],
+}
+
+
+class SyntheticGitHub:
+    """Deterministic fake GitHub data for one or more users."""
+
+    def __init__(self, repo_count, seed=0, days=371, history_years=5):
+        self.repo_count = repo_count
+        self.seed = seed
+        self.days = days
+        self.history_years = history_years
+
+    def user(self, login):
+        return {
+            "login": login,
+            "followers": 42,
+            "public_repos": self.repo_count,
+        }
+
+    def repo(self, login, index, base_url):
+        rng = random.Random(f"{self.seed}-{login}-{index}")
+        return {
+            "id": index + 1,
+            "name": f"repo-{index}",
+            "full_name": f"{login}/repo-{index}",
+            "fork": rng.random() < 0.15,
+            "stargazers_count": rng.randint(0, 50),
+            "size": rng.randint(10, 50000),
+            "pushed_at": f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}T00:00:00Z",
+            "languages_url": f"{base_url}/repos/{login}/repo-{index}/languages",
+        }
+
+    def repos(self, login, base_url):
+        return [self.repo(login, i, base_url) for i in range(self.repo_count)]
+
+    def languages(self, login, index):
+        rng = random.Random(f"{self.seed}-{login}-{index}-langs")
+        picks = rng.sample(BENCH_LANGUAGES, rng.randint(1, 4))
+        return {name: rng.randint(100, 200000) for name, _ in picks}
+
+    def day_count(self, login, day):
+        """Contributions on one day; stable across overlapping windows."""
+        rng = random.Random(f"{self.seed}-{login}-{day.toordinal()}")
+        return 0 if rng.random() < 0.3 else rng.randint(1, 12)
+
+    def calendar(self, login, start=None, end=None):
+        end = end or date.today()
+        start = start or end - timedelta(days=self.days - 1)
+        first_week = start - timedelta(days=(start.weekday() + 1) % 7)  # Weeks start on Sunday
+
+        weeks = []
+        week_start = first_week
+        while week_start <= end:
+            week = []
+            for offset in range(7):
+                day = week_start + timedelta(days=offset)
+                if start <= day <= end:
+                    week.append({
+                        "date": day.isoformat(),
+                        "contributionCount": self.day_count(login, day),
+                        "color": "#39d353",
+                    })
+            weeks.append({"contributionDays": week})
+            week_start += timedelta(days=7)
+
+        total = sum(d["contributionCount"] for w in weeks for d in w["contributionDays"])
+        return {"totalContributions": total, "weeks": weeks}
+
+    def contribution_years(self):
+        today = date.today()
+        return list(range(today.year, today.year - self.history_years, -1))
+
+    def contributions(self, login):
+        return {
+            "totalCommitContributions": 321,
+            "totalPullRequestContributions": 45,
+            "totalIssueContributions": 12,
+            "totalPullRequestReviewContributions": 30,
+            "contributionCalendar": self.calendar(login),
+        }
+
+    def language_page(self, login, index, cursor, first):
+        """A GraphQL LanguageConnection page for one repo, largest first."""
+        colors = dict(BENCH_LANGUAGES)
+        langs = sorted(self.languages(login, index).items(), key=lambda x: -x[1])
+        offset = int(cursor or 0)
+        return {
+            "pageInfo": {"hasNextPage": offset + first < len(langs), "endCursor": str(offset + first)},
+            "edges": [
+                {"size": size, "node": {"name": name, "color": colors[name]}}
+                for name, size in langs[offset:offset + first]
+            ],
+        }
+
+    def graphql(self, query, variables):
+        if "repository(" in query:
+            index = int(variables["name"].rsplit("-", 1)[1])
+            languages = self.language_page(
+                variables["owner"], index, variables.get("cursor"), variables.get("languages", 100)
+            )
+            return {"data": {"repository": {"languages": languages}}}
+
+        login = variables.get("login") or re.search(r'login:\s*"([^"]+)"', query).group(1)
+        user = {"login": login}
+
+        if "repositories(" in query and "first: 100" in query:
+            owned = [
+                (i, self.repo(login, i, ""))
+                for i in range(self.repo_count)
+            ]
+            owned = [(i, repo) for i, repo in owned if not repo["fork"]]
+            offset = int(variables.get("cursor") or 0)
+            page = owned[offset:offset + 100]
+            nodes = []
+            for index, repo in page:
+                node = {"name": repo["name"], "stargazerCount": repo["stargazers_count"]}
+                if "languages(" in query:
+                    node["languages"] = self.language_page(login, index, None, variables.get("languages", 10))
+                nodes.append(node)
+            user["repositories"] = {
+                "totalCount": len(owned),
+                "pageInfo": {
+                    "hasNextPage": offset + 100 < len(owned),
+                    "endCursor": str(offset + 100),
+                },
+                "nodes": nodes,
+            }
+            if "followers" in query and variables.get("firstPage", True):
+                user["followers"] = {"totalCount": 42}
+                user["publicRepos"] = {"totalCount": self.repo_count}
+                user["contributionsCollection"] = self.contributions(login)
+                if variables.get("withCalendar") is False:
+                    del user["contributionsCollection"]["contributionCalendar"]
+        elif "contributionYears" in query:
+            user["contributionsCollection"] = {"contributionYears": self.contribution_years()}
+        elif "recent:" in query:
+            start = date.fromisoformat(variables["from"][:10])
+            end = min(date.fromisoformat(variables["to"][:10]), date.today())
+            user["recent"] = {"contributionCalendar": self.calendar(login, start, end)}
+            if variables.get("withTotals"):
+                totals = self.contributions(login)
+                del totals["contributionCalendar"]
+                user["totals"] = totals
+        elif "from" in variables:
+            start = date.fromisoformat(variables["from"][:10])
+            end = min(date.fromisoformat(variables["to"][:10]), date.today())
+            user["contributionsCollection"] = {"contributionCalendar": self.calendar(login, start, end)}
+        elif "contributionsCollection" in query:
+            user["contributionsCollection"] = self.contributions(login)
+
+        data = {"user": user}
+        if "rateLimit" in query:
+            data["rateLimit"] = {"cost": 1, "remaining": 4999, "limit": 5000, "resetAt": None}
+        return {"data": data}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serve synthetic GitHub REST and GraphQL responses."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed
+    # ACKs add ~40ms to every keep-alive response and swamp the results
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _fail(self, login):
+        """Answer 404 if the stand-in should still fail requests for `login`."""
+        if not self.server.take_failure(login):
+            return False
+        self.send_error(404)
+        return True
+
+    def _delay(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency + random.uniform(0, server.jitter))
+
+    def _send_json(self, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        headers = dict(headers or {})
+        headers.update({
+            "ETag": etag,
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4999",
+            "X-RateLimit-Reset": str(int(time.time()) + 3600),
+            "X-RateLimit-Resource": "core",
+        })
+
+        if self.command == "GET" and self.headers.get("If-None-Match") == etag:
+            self.server.count("not_modified")
+            self.send_response(304)
+            body = b""
+        else:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.count("requests")
+        self._delay()
+        parts = urlsplit(self.path)
+        path = parts.path
+        query = parse_qs(parts.query)
+        data = self.server.data
+        base_url = f"http://{self.headers.get('Host')}"
+
+        if path in self.server.fixtures:
+            return self._send_json(self.server.fixtures[path])
+
+        if path == "/rate_limit":
+            reset = int(time.time()) + 3600
+            return self._send_json({"resources": {
+                "core": {"limit": 5000, "remaining": 4999, "reset": reset},
+                "graphql": {"limit": 5000, "remaining": 4999, "reset": reset},
+            }})
+
+        match = re.fullmatch(r"/users/([^/]+)", path)
+        if match:
+            if self._fail(match.group(1)):
+                return
+            return self._send_json(data.user(match.group(1)))
+
+        match = re.fullmatch(r"/users/([^/]+)/repos", path)
+        if match:
+            login = match.group(1)
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            repos = data.repos(login, base_url)
+            last = max(1, -(-len(repos) // per_page))
+            links = []
+            if page < last:
+                links.append(f'<{base_url}/users/{login}/repos?per_page={per_page}&page={page + 1}>; rel="next"')
+                links.append(f'<{base_url}/users/{login}/repos?per_page={per_page}&page={last}>; rel="last"')
+            headers = {"Link": ", ".join(links)} if links else {}
+            return self._send_json(repos[(page - 1) * per_page:page * per_page], headers)
+
+        match = re.fullmatch(r"/repos/([^/]+)/repo-(\d+)/languages", path)
+        if match:
+            return self._send_json(data.languages(match.group(1), int(match.group(2))))
+
+        self.send_error(404)
+
+    def do_POST(self):
+        self.server.count("requests")
+        self.server.count("graphql")
+        self._delay()
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self._fail((payload.get("variables") or {}).get("login")):
+            return
+        response = self.server.data.graphql(payload.get("query", ""), payload.get("variables") or {})
+        self._send_json(response)
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local GitHub API stand-in with latency injection and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, data, latency_ms=0, jitter_ms=0, fixtures=None, address=("127.0.0.1", 0),
+                 failures=None):
+        super().__init__(address, StandInHandler)
+        self.data = data
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.fixtures = fixtures or {}
+        # Remaining requests to fail per login, to exercise retries
+        self.failures = dict(failures or {})
+        self.counters = {"requests": 0, "graphql": 0, "not_modified": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+    def count(self, name):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+
+    def take_failure(self, login):
+        with self._lock:
+            if not self.failures.get(login):
+                return False
+            self.failures[login] -= 1
+            self.counters["failed"] = self.counters.get("failed", 0) + 1
+            return True
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def run_scenario(repo_count, mode, latency_ms, jitter_ms, runs, fixtures):
+    """Run the generator pipeline in this process and return its measurements."""
+    server = StandInServer(SyntheticGitHub(repo_count), latency_ms, jitter_ms, fixtures).start()
+    work_dir = tempfile.mkdtemp(prefix="readme-stats-bench-")
+
+    os.environ["GITHUB_API_URL"] = server.base_url
+    os.environ["GITHUB_GRAPHQL_URL"] = f"{server.base_url}/graphql"
+    os.environ["HTTP_CACHE_DIR"] = os.path.join(work_dir, "http")
+    os.environ["STATE_DIR"] = os.path.join(work_dir, "state")
+    os.environ["STATS_FETCH_MODE"] = mode
+
+    # Imported only now so the settings above are picked up
+    from . import cards, contributions, github
+
+    token = "bench-token"
+    username = "bench-user"
+    results = []
+
+    for run in range(runs):
+        before = dict(server.counters)
+        timings = {}
+
+        def timed(stage, func, *args, **kwargs):
+            start = time.perf_counter()
+            value = func(*args, **kwargs)
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+            return value
+
+        start = time.perf_counter()
+        if mode == "graphql":
+            dataset = timed("fetch", github.fetch_stats_graphql, username, token)
+            user_data = dataset["user_data"]
+            total_stars = dataset["total_stars"]
+            contribution_stats = dataset["contribution_stats"]
+            languages = timed(
+                "aggregate", cards.summarize_languages, dataset["languages"],
+                colors=dataset["language_colors"],
+            )
+        else:
+            user_data = timed("fetch", github.fetch_user_data, username, token)
+            repos = timed("fetch", github.fetch_repos, username, token)
+            total_stars = github.calculate_total_stars(repos)
+            contribution_stats = timed("fetch", github.fetch_contributions_data, username, token)
+            languages = timed(
+                "aggregate", github.aggregate_languages, repos, token,
+                state_path=github.get_language_state_path(username),
+            )
+
+        timed("streaks", contributions.calculate_streaks, contribution_stats["calendar"])
+        rendered = timed("render", cards.render_user_cards, {
+            "username": username,
+            "user_data": user_data,
+            "total_stars": total_stars,
+            "contribution_stats": contribution_stats,
+            "languages": languages,
+        })
+        wall = time.perf_counter() - start
+
+        # What the compact heatmap saves over one rect per day, outside the timings
+        streak_args = (contribution_stats["calendar"], contribution_stats.get("history"),
+                       contribution_stats.get("streaks"))
+        heatmap_saved = (len(cards.render_streak_svg(*streak_args, style="rects"))
+                         - len(cards.render_streak_svg(*streak_args, style="compact")))
+
+        results.append({
+            "repos": repo_count,
+            "mode": mode,
+            "run": run + 1,
+            "wall_s": wall,
+            "requests": server.counters["requests"] - before["requests"],
+            "not_modified": server.counters["not_modified"] - before["not_modified"],
+            "stages_s": timings,
+            "output_bytes": sum(len(card) for card in rendered.values()),
+            "heatmap_saved_bytes": heatmap_saved,
+            "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        })
+
+    server.shutdown()
+    return results
+
+
+def child_env(**overrides):
+    """Environment for a child interpreter that can import readme_stats."""
+    env = dict(os.environ, **overrides)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get("PYTHONPATH")]))
+    return env
+
+
+def measure_imports(argv, env):
+    """Run `python -X importtime` on argv; return (import ms, module names)."""
+    command = [sys.executable, "-X", "importtime", *argv]
+    stderr = subprocess.run(command, env=env, capture_output=True, text=True).stderr
+    total_us = 0
+    modules = set()
+    for line in stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)", line)
+        if match:
+            total_us += int(match.group(1))
+            modules.add(match.group(2))
+    return total_us / 1000, modules
+
+
+def check_imports(budget_ms=IMPORT_BUDGET_MS):
+    """Check the offline commands' import cost and that they stay lazy.
+
+    Returns 0 if every command is within budget and loads none of
+    NETWORK_MODULES, 1 otherwise.
+    """
+    work_dir = tempfile.mkdtemp(prefix="readme-stats-imports-")
+    env = child_env(SNAPSHOT_DIR=os.path.join(work_dir, "snapshots"), RUN_REPORT="")
+    baseline_ms, baseline = measure_imports(["-c", "pass"], env)
+
+    failed = False
+    print(f"{'command':>10} {'import ms':>10} {'modules':>8}  network modules")
+    for name, argv in IMPORT_CHECKS.items():
+        argv = [arg.format(work_dir=work_dir) for arg in argv]
+        import_ms, modules = measure_imports(["-m", "readme_stats", *argv], env)
+        extra_ms = import_ms - baseline_ms
+        loaded = sorted(module for module in NETWORK_MODULES if module in modules)
+        over = extra_ms > budget_ms
+        failed = failed or over or bool(loaded)
+        print(
+            f"{name:>10} {extra_ms:>10.1f} {len(modules - baseline):>8}  {', '.join(loaded) or '-'}"
+            f"{'  OVER BUDGET' if over else ''}"
+        )
+    print(f"Budget: {budget_ms:.0f} ms of imports beyond a bare interpreter")
+    return 1 if failed else 0
+
+
+def run_child(args, repo_count):
+    """Run one scenario in a fresh interpreter so peak RSS is per scenario."""
+    command = [
+        sys.executable, "-m", "readme_stats.bench", "--child",
+        "--repos", str(repo_count),
+        "--mode", args.mode,
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--runs", str(args.runs),
+    ]
+    if args.fixtures:
+        command += ["--fixtures", args.fixtures]
+    output = subprocess.run(command, check=True, capture_output=True, text=True, env=child_env()).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_sharded(args):
+    """Run a sharded batch as local worker processes, then merge it.
+
+    Each of the --shards workers is a separate `readme_stats all --shard`
+    process with its own token and its own cache, state and snapshot
+    directories, as it would have on its own machine. Users listed in
+    --fail-users have their first request answered with a 404, so the
+    shard retries and the merge report show them.
+    """
+    failures = {login: 1 for login in (args.fail_users or "").split(",") if login}
+    server = StandInServer(
+        SyntheticGitHub(args.repos[0]), args.latency_ms, args.jitter_ms, failures=failures
+    ).start()
+    work_dir = tempfile.mkdtemp(prefix="readme-stats-shards-")
+    users_file = os.path.join(work_dir, "users.txt")
+    with open(users_file, "w", encoding="utf-8") as f:
+        f.writelines(f"bench-user-{i}\n" for i in range(args.users_count))
+        f.writelines(f"{login}\n" for login in failures)
+
+    env = child_env(
+        GITHUB_API_URL=server.base_url,
+        GITHUB_GRAPHQL_URL=f"{server.base_url}/graphql",
+        GITHUB_TOKENS=",".join(f"bench-token-{i}" for i in range(args.shards)),
+        STATS_FETCH_MODE=args.mode,
+        RUN_REPORT="",
+    )
+    start = time.perf_counter()
+    workers = []
+    for index in range(args.shards):
+        node = os.path.join(work_dir, f"node-{index}")
+        worker_env = dict(
+            env,
+            HTTP_CACHE_DIR=os.path.join(node, "http"),
+            STATE_DIR=os.path.join(node, "state"),
+            SNAPSHOT_DIR=os.path.join(node, "snapshots"),
+        )
+        command = [
+            sys.executable, "-m", "readme_stats", "all", "--users-file", users_file,
+            "--shard", f"{index}/{args.shards}", "--output-dir", os.path.join(node, "out"),
+        ]
+        log = open(os.path.join(node + ".log"), "w")
+        workers.append((subprocess.Popen(command, env=worker_env, stdout=log, stderr=subprocess.STDOUT), log))
+    for process, log in workers:
+        process.wait()
+        log.close()
+    wall = time.perf_counter() - start
+    server.shutdown()
+
+    print(f"{args.shards} shard workers, {args.users_count + len(failures)} users, "
+          f"{args.repos[0]} repos each: {wall:.2f} s, {server.counters['requests']} requests, "
+          f"{server.counters.get('failed', 0)} failed on purpose")
+    print(f"Worker logs: {work_dir}/node-*.log")
+    command = [
+        sys.executable, "-m", "readme_stats", "merge", "--users-file", users_file,
+        "--shards", str(args.shards), "--output-dir", os.path.join(work_dir, "merged"),
+        *(os.path.join(work_dir, f"node-{index}", "out") for index in range(args.shards)),
+    ]
+    return subprocess.run(command, env=env).returncode
+
+
+def print_report(results):
+    """Print benchmark results as a table."""
+    header = f"{'repos':>6} {'mode':>8} {'run':>4} {'wall s':>8} {'reqs':>6} {'304s':>5} {'rss MB':>7}"
+    header += "".join(f" {stage + ' ms':>13}" for stage in STAGES)
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        line = (
+            f"{result['repos']:>6} {result['mode']:>8} {result['run']:>4} {result['wall_s']:>8.3f}"
+            f" {result['requests']:>6} {result['not_modified']:>5} {result['peak_rss_kb'] / 1024:>7.1f}"
+        )
+        line += "".join(f" {result['stages_s'].get(stage, 0) * 1000:>13.1f}" for stage in STAGES)
+        print(line)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the README stats generator offline.")
+    parser.add_argument("--repos", type=int, nargs="+", default=[10, 100, 1000],
+                        help="repo counts to benchmark (10 to 5000)")
+    parser.add_argument("--mode", choices=["rest", "graphql"], default="rest",
+                        help="fetch path to exercise")
+    parser.add_argument("--latency-ms", type=float, default=0, help="latency added to each response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random extra latency per response")
+    parser.add_argument("--runs", type=int, default=2,
+                        help="runs per scenario; later runs exercise caches and incremental state")
+    parser.add_argument("--fixtures", help="JSON file mapping API paths to recorded response bodies")
+    parser.add_argument("--json", help="also write results to this JSON file")
+    parser.add_argument("--imports", action="store_true",
+                        help="check the offline commands' import time and laziness instead")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                        help="import time allowed per offline command")
+    parser.add_argument("--shards", type=int,
+                        help="run a sharded batch with this many local worker processes instead")
+    parser.add_argument("--users-count", type=int, default=20, help="users in the sharded batch")
+    parser.add_argument("--fail-users",
+                        help="comma-separated extra users whose first request fails (sharded batch)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.imports:
+        return check_imports(args.import_budget_ms)
+    if args.shards:
+        return run_sharded(args)
+
+    fixtures = None
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as f:
+            fixtures = json.load(f)
+
+    if args.child:
+        # Keep the generator's progress output away from the JSON result
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            results = run_scenario(args.repos[0], args.mode, args.latency_ms, args.jitter_ms,
+                                   args.runs, fixtures)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        print(json.dumps(results))
+        return 0
+
+    results = []
+    for repo_count in args.repos:
+        results.extend(run_child(args, repo_count))
+
+    print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Process-pool rendering of many datasets (batch mode)."""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .cards import render_user_cards
+from .config import RENDER_CHUNK_SIZE, RENDER_WORKERS
+from .contributions import ContributionCalendar, pack_calendar, unpack_calendar
+from .metrics import run_metrics
+from .storage import write_card_files
+
+
+def pack_dataset(dataset):
+    """Reduce a dataset to the compact tuple sent to render processes.
+
+    Only fields the renderers read are kept. Streaks are computed here so
+    full-history calendars never cross the process boundary, and a
+    calendar of consecutive days travels as packed counts and palette
+    indexes instead of one dict per day.
+    """
+    user_data = dataset.get("user_data") or {}
+    stats = dataset.get("contribution_stats") or {}
+    calendar_data = stats.get("calendar")
+    streaks = stats.get("streaks")
+    if calendar_data and calendar_data.get("weeks") and not streaks:
+        calendar = stats.get("history") or ContributionCalendar.from_calendar_data(calendar_data)
+        streaks = calendar.streaks()
+
+    return (
+        dataset["username"],
+        {key: user_data[key] for key in ("login", "followers", "public_repos") if key in user_data},
+        dataset.get("total_stars", 0),
+        {key: stats[key] for key in ("commits", "pull_requests", "issues", "reviews") if key in stats},
+        pack_calendar(calendar_data),
+        streaks,
+        [(lang["name"], lang["percentage"], lang["color"]) for lang in dataset.get("languages") or []],
+    )
+
+
+def unpack_dataset(payload):
+    """Rebuild a renderable dataset from pack_dataset() output."""
+    username, user_data, total_stars, stats, calendar, streaks, languages = payload
+    contribution_stats = dict(stats, calendar=unpack_calendar(calendar), streaks=streaks)
+    return {
+        "username": username,
+        "user_data": user_data or None,
+        "total_stars": total_stars,
+        "contribution_stats": contribution_stats,
+        "languages": [
+            {"name": name, "percentage": percentage, "color": color}
+            for name, percentage, color in languages
+        ],
+    }
+
+
+def render_chunk(payloads, output_root):
+    """Render and write cards for a chunk of packed datasets.
+
+    Runs inside a render process. Returns (username, cards rendered from
+    data, cards changed on disk) per user.
+    """
+    results = []
+    for payload in payloads:
+        dataset = unpack_dataset(payload)
+        user_dir = os.path.join(output_root, dataset["username"])
+        os.makedirs(user_dir, exist_ok=True)
+        failed = []
+        cards = render_user_cards(dataset, failed=failed)
+        changed = sum(
+            write_card_files(os.path.join(user_dir, name), data) for name, data in cards.items()
+        )
+        results.append((dataset["username"], len(cards) - len(failed), changed))
+    return results
+
+
+@run_metrics.stage("render.bulk")
+def render_datasets(datasets, output_root, workers=None, chunk_size=None, total=None):
+    """Render many users' cards across a process pool.
+
+    `datasets` may be any iterable (e.g. a generator yielding users as they
+    are fetched). Datasets are packed, grouped into chunks of `chunk_size`
+    and handed to worker processes, which write the cards to
+    output_root/<username>/. At most two chunks per worker are queued at
+    once. Progress is printed as chunks finish. Returns {username: cards
+    rendered from data}.
+    """
+    workers = workers or RENDER_WORKERS or os.cpu_count() or 1
+    chunk_size = max(1, chunk_size or RENDER_CHUNK_SIZE)
+    results = {}
+    changed = 0
+    started = time.monotonic()
+
+    def collect(done):
+        nonlocal changed
+        for future in done:
+            for username, rendered, written in future.result():
+                results[username] = rendered
+                changed += written
+        rate = len(results) / max(time.monotonic() - started, 1e-9)
+        progress = f"{len(results)}/{total}" if total else str(len(results))
+        print(f"  Rendered {progress} users ({rate:.0f} users/s)")
+
+    # Spawned, not forked: the fetch threads may be mid-request while we start
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = set()
+        chunk = []
+        for dataset in datasets:
+            chunk.append(pack_dataset(dataset))
+            if len(chunk) < chunk_size:
+                continue
+            pending.add(executor.submit(render_chunk, chunk, output_root))
+            chunk = []
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        if chunk:
+            pending.add(executor.submit(render_chunk, chunk, output_root))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    print(f"  {changed} card files changed")
+    return results
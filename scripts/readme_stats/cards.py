@@ -0,0 +1,442 @@
+"""SVG card rendering."""
+
+import heapq
+import os
+from functools import lru_cache
+
+from .config import (
+    CARD_CLASSES,
+    CARD_STYLES,
+    CONTRIB_COLORS,
+    HEATMAP_STYLE,
+    LANGUAGE_EXCLUDE,
+    LANGUAGE_MIN_BYTES,
+    LANGUAGE_OTHER,
+    LANG_COLORS,
+    THEME,
+    THEMES,
+    TOP_LANGUAGES,
+)
+from .contributions import ContributionCalendar, get_contrib_color, get_contrib_level
+from .metrics import run_metrics
+from .storage import write_card
+
+
+def summarize_languages(languages, limit=None, colors=None, other=None,
+                        exclude=None, min_bytes=None):
+    """Turn language byte totals into the list used by the languages card.
+
+    Percentages are shares of the total over every language kept after
+    `exclude` and `min_bytes`, not just the `limit` shown. With `other`,
+    the remaining languages are summed into a final "Other" entry.
+    `colors` supplies fallback colors for languages missing from
+    LANG_COLORS. Unset options come from the TOP_LANGUAGES/LANGUAGE_*
+    settings.
+    """
+    limit = TOP_LANGUAGES if limit is None else limit
+    other = LANGUAGE_OTHER if other is None else other
+    exclude = LANGUAGE_EXCLUDE if exclude is None else {name.lower() for name in exclude}
+    min_bytes = LANGUAGE_MIN_BYTES if min_bytes is None else min_bytes
+    colors = colors or {}
+
+    kept = [
+        (lang, bytes_count)
+        for lang, bytes_count in languages.items()
+        if bytes_count > 0 and bytes_count >= min_bytes and lang.lower() not in exclude
+    ]
+    total = sum(bytes_count for _, bytes_count in kept)
+    if total == 0:
+        return []
+
+    # Largest first, ties broken by name so output is stable between runs
+    top = heapq.nsmallest(limit, kept, key=lambda x: (-x[1], x[0]))
+
+    result = []
+    for lang, bytes_count in top:
+        result.append({
+            "name": lang,
+            "bytes": bytes_count,
+            "percentage": (bytes_count / total) * 100,
+            "color": LANG_COLORS.get(lang, colors.get(lang, "#858585"))
+        })
+
+    rest = total - sum(bytes_count for _, bytes_count in top)
+    if other and rest > 0:
+        result.append({
+            "name": "Other",
+            "bytes": rest,
+            "percentage": (rest / total) * 100,
+            "color": "#858585",
+        })
+    
+    return result
+
+
+@lru_cache(maxsize=None)
+def compile_card_head(card, theme):
+    """Static head of a card for a theme, built once per process.
+
+    Holds the <style> block with the card's text classes and, for all but
+    placeholders, the background gradient. Only sizes and data are filled
+    in per render.
+    """
+    colors = THEMES[theme]
+    rules = "".join(
+        f".{name}{{{CARD_STYLES[name].format(**colors)}}}" for name in CARD_CLASSES[card]
+    )
+    parts = [f"  <style>text{{font-family:Arial,sans-serif}}{rules}</style>"]
+    if card != "placeholder":
+        parts.extend([
+            '  <defs>',
+            f'    <linearGradient id="{card}Grad" x1="0%" y1="0%" x2="100%" y2="100%">',
+            f'      <stop offset="0%" style="stop-color:{colors["bg"]};stop-opacity:1" />',
+            f'      <stop offset="100%" style="stop-color:{colors["bg_end"]};stop-opacity:1" />',
+            '    </linearGradient>',
+            '  </defs>',
+        ])
+    return "\n".join(parts)
+
+
+def render_card_head(card, width, height, theme=None):
+    """Opening <svg> tag, compiled head and background rect of a card."""
+    theme = theme or THEME
+    fill = THEMES[theme]["bg"] if card == "placeholder" else f"url(#{card}Grad)"
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+        f"{compile_card_head(card, theme)}\n"
+        f'  <rect width="{width}" height="{height}" fill="{fill}" rx="10"/>'
+    )
+
+
+def render_placeholder_svg(message="Data unavailable", theme=None):
+    """Render a placeholder SVG as UTF-8 bytes."""
+    return f'''{render_card_head("placeholder", 400, 150, theme)}
+  <text x="200" y="75" class="msg">{message}</text>
+  <text x="200" y="100" class="hint">Please try again later</text>
+</svg>
+'''.encode("utf-8")
+
+
+def write_placeholder_svg(filepath, message="Data unavailable"):
+    """Write a placeholder SVG when data is unavailable."""
+    write_card(filepath, render_placeholder_svg(message), "Wrote placeholder to")
+
+
+def render_stats_svg(user_data, total_stars, contribution_stats, theme=None):
+    """Render the stats card as SVG bytes, or None without user data."""
+    if not user_data:
+        return None
+
+    username = user_data.get("login", "Unknown")
+    contribution_stats = contribution_stats or {}
+    # (icon, label, value, x of the value)
+    rows = [
+        ("⭐", "Total Stars:", total_stars, 130),
+        ("📦", "Public Repos:", user_data.get("public_repos", 0), 130),
+        ("👥", "Followers:", user_data.get("followers", 0), 130),
+        ("🧑‍💻", "Commits (last year):", contribution_stats.get("commits", 0), 200),
+        ("🔀", "Pull Requests:", contribution_stats.get("pull_requests", 0), 200),
+        ("❗", "Issues Opened:", contribution_stats.get("issues", 0), 200),
+        ("📝", "PR Reviews:", contribution_stats.get("reviews", 0), 200),
+    ]
+
+    height = 320
+
+    svg_parts = [
+        render_card_head("stats", 400, height, theme),
+        f'  <text x="25" y="35" class="title">{username}\'s GitHub Stats</text>',
+    ]
+    for index, (icon, label, value, value_x) in enumerate(rows):
+        svg_parts.extend([
+            f'  <g transform="translate(25, {60 + index * 35})">',
+            f'    <text y="20" class="icon">{icon}</text>',
+            f'    <text x="25" y="20" class="label">{label}</text>',
+            f'    <text x="{value_x}" y="20" class="value">{value:,}</text>',
+            '  </g>',
+        ])
+    svg_parts.append('</svg>\n')
+
+    return "\n".join(svg_parts).encode("utf-8")
+
+
+@run_metrics.stage("render.stats")
+def generate_stats_svg(user_data, total_stars, contribution_stats, output_path):
+    """Generate the stats.svg file."""
+    print("Generating stats.svg...")
+
+    svg = render_stats_svg(user_data, total_stars, contribution_stats)
+    if svg is None:
+        write_placeholder_svg(output_path, "User data unavailable")
+        return False
+    
+    write_card(output_path, svg)
+    return True
+
+
+def render_top_langs_svg(languages, theme=None):
+    """Render the languages card as SVG bytes, or None without data."""
+    if not languages:
+        return None
+    
+    # Calculate bar positions
+    bar_height = 20
+    padding = 25
+    header_height = 45
+    height = header_height + len(languages) * (bar_height + 10) + padding
+    
+    svg_parts = [
+        render_card_head("langs", 400, height, theme),
+        '  <text x="25" y="30" class="title">Most Used Languages</text>',
+    ]
+    
+    y_offset = header_height
+    bar_width = 300
+    track = THEMES[theme or THEME]["track"]
+    
+    for lang in languages:
+        lang_width = (lang["percentage"] / 100) * bar_width
+        
+        svg_parts.extend([
+            f'  <g transform="translate(25, {y_offset})">',
+            f'    <circle cx="8" cy="10" r="6" fill="{lang["color"]}"/>',
+            f'    <text x="22" y="14" class="name">{lang["name"]}</text>',
+            f'    <text x="350" y="14" class="pct">{lang["percentage"]:.1f}%</text>',
+            f'    <rect x="0" y="20" width="{bar_width}" height="8" fill="{track}" rx="4"/>',
+            f'    <rect x="0" y="20" width="{lang_width}" height="8" fill="{lang["color"]}" rx="4"/>',
+            '  </g>',
+        ])
+        
+        y_offset += bar_height + 15
+    
+    svg_parts.append('</svg>')
+    
+    return '\n'.join(svg_parts).encode("utf-8")
+
+
+@run_metrics.stage("render.top_langs")
+def generate_top_langs_svg(languages, output_path):
+    """Generate the top-langs.svg file."""
+    print("Generating top-langs.svg...")
+    
+    svg = render_top_langs_svg(languages)
+    if svg is None:
+        write_placeholder_svg(output_path, "Language data unavailable")
+        return False
+    
+    write_card(output_path, svg)
+    return True
+
+
+def render_compact_cells(cells, left, top, cell_size):
+    """Heatmap cells as <use> references grouped by fill color.
+
+    One rounded cell is defined once and every day reuses it; the offset
+    moves to a single group transform so coordinates stay short integers.
+    """
+    groups = {}
+    for x, y, color in cells:
+        groups.setdefault(color, []).append((x, y))
+
+    parts = [
+        f'  <defs><rect id="d" width="{cell_size}" height="{cell_size}" rx="2"/></defs>',
+        f'  <g transform="translate({left},{top})">',
+    ]
+    for color, positions in groups.items():
+        parts.append(f'  <g fill="{color}">')
+        for x, y in positions:
+            attrs = (f' x="{x}"' if x else "") + (f' y="{y}"' if y else "")
+            parts.append(f'<use href="#d"{attrs}/>')
+        parts.append('  </g>')
+    parts.append('  </g>')
+    return parts
+
+
+def render_streak_svg(calendar_data, history=None, streaks=None, theme=None, style=None):
+    """Render the contributions heatmap as SVG bytes, or None without data.
+
+    The heatmap always shows `calendar_data`; when a full-history
+    ContributionCalendar is given, streaks and active days use it instead.
+    Precomputed `streaks` (e.g. from the incremental refresh) win over both.
+    `style` overrides HEATMAP_STYLE.
+    """
+    if not calendar_data or not calendar_data.get("weeks"):
+        return None
+
+    weeks = calendar_data.get("weeks", [])
+    calendar = ContributionCalendar.from_calendar_data(calendar_data)
+    total_contributions = calendar_data.get("totalContributions", calendar.total())
+    streaks = streaks or (history or calendar).streaks()
+    ramp = THEMES[theme or THEME]["contrib"]
+    
+    # Calendar dimensions
+    cell_size = 12
+    cell_gap = 3
+    cell_total = cell_size + cell_gap
+    left_margin = 35  # Space for day labels
+    top_margin = 35   # Space for month labels
+    
+    num_weeks = len(weeks)
+    width = left_margin + num_weeks * cell_total + 20
+    height = top_margin + 7 * cell_total + 70  # Extra space for legend and stats
+    
+    svg_parts = [
+        render_card_head("streak", width, height, theme),
+        f'  <text x="{width / 2:g}" y="20" class="heading">{total_contributions:,} contributions in the last year</text>',
+        f'  <text x="{width / 2:g}" y="38" class="sub">Current streak: {streaks["current"]} days • Longest streak: {streaks["longest"]} days • Active days: {streaks["active_days"]}</text>',
+    ]
+    
+    # Day labels (Mon, Wed, Fri)
+    day_labels = ["", "Mon", "", "Wed", "", "Fri", ""]
+    for i, label in enumerate(day_labels):
+        if label:
+            y = top_margin + i * cell_total + cell_size - 2
+            svg_parts.append(f'  <text x="5" y="{y}" class="muted">{label}</text>')
+    
+    # Month labels
+    for week_idx, month_name in calendar.month_labels():
+        x = left_margin + week_idx * cell_total
+        svg_parts.append(f'  <text x="{x}" y="{top_margin - 8}" class="muted">{month_name}</text>')
+    
+    # Draw cells
+    cells = []  # (x, y, color) relative to the grid origin
+    for week_idx, week in enumerate(weeks):
+        days = week.get("contributionDays", [])
+        for day_idx, day in enumerate(days):
+            count = day.get("contributionCount", 0)
+            color = day.get("color", get_contrib_color(count))
+            if ramp:
+                color = ramp[get_contrib_level(count, color)]
+            cells.append((week_idx * cell_total, day_idx * cell_total, color))
+
+    if (style or HEATMAP_STYLE) == "compact":
+        svg_parts.extend(render_compact_cells(cells, left_margin, top_margin, cell_size))
+    else:
+        for x, y, color in cells:
+            svg_parts.append(f'  <rect x="{left_margin + x}" y="{top_margin + y}" width="{cell_size}" height="{cell_size}" fill="{color}" rx="2"/>')
+    
+    # Legend
+    legend_y = top_margin + 7 * cell_total + 15
+    svg_parts.append(f'  <text x="{width - 120}" y="{legend_y}" class="muted">Less</text>')
+    
+    legend_x = width - 95
+    for i, color in enumerate(ramp or CONTRIB_COLORS):
+        svg_parts.append(f'  <rect x="{legend_x + i * 15}" y="{legend_y - 10}" width="12" height="12" fill="{color}" rx="2"/>')
+    
+    svg_parts.append(f'  <text x="{legend_x + 75}" y="{legend_y}" class="muted">More</text>')
+
+    summary_y = legend_y + 22
+    svg_parts.append(f'  <text x="{width / 2:g}" y="{summary_y}" class="note">Daily contributions shown for the past year</text>')
+    
+    svg_parts.append('</svg>')
+    
+    return '\n'.join(svg_parts).encode("utf-8")
+
+
+@run_metrics.stage("render.streak")
+def generate_streak_svg(calendar_data, output_path, history=None, streaks=None):
+    """Generate the streak.svg file (contributions calendar heatmap)."""
+    print("Generating streak.svg...")
+
+    svg = render_streak_svg(calendar_data, history, streaks)
+    if svg is None:
+        message = "No contribution data" if calendar_data else "Contribution data unavailable"
+        write_placeholder_svg(output_path, message)
+        return False
+
+    write_card(output_path, svg)
+    return True
+
+
+@run_metrics.stage("render.cards")
+def render_user_cards(dataset, theme=None, failed=None):
+    """Render all three cards for a dataset, as {filename: SVG bytes}.
+
+    Cards that cannot be rendered are replaced by placeholders and their
+    names appended to `failed` if given. `theme` defaults to STATS_THEME.
+    """
+    contribution_stats = dataset.get("contribution_stats") or {}
+    calendar_data = contribution_stats.get("calendar")
+    history = contribution_stats.get("history")
+    streaks = contribution_stats.get("streaks")
+    renderers = {
+        "stats.svg": (
+            lambda: render_stats_svg(
+                dataset["user_data"], dataset["total_stars"], dataset["contribution_stats"], theme
+            ),
+            "Stats unavailable",
+        ),
+        "top-langs.svg": (
+            lambda: render_top_langs_svg(dataset["languages"], theme),
+            "Languages unavailable",
+        ),
+        "streak.svg": (
+            lambda: render_streak_svg(calendar_data, history, streaks, theme),
+            "Contributions unavailable",
+        ),
+    }
+
+    cards = {}
+    for name, (render, message) in renderers.items():
+        try:
+            svg = render()
+        except Exception as e:
+            print(f"Error rendering {name}: {e}")
+            svg = None
+        if svg is None:
+            svg = render_placeholder_svg(message, theme)
+            if failed is not None:
+                failed.append(name)
+        cards[name] = svg
+    return cards
+
+
+def write_user_cards(dataset, output_dir, names=None):
+    """Write the SVG cards for a fetched dataset.
+
+    `names` limits which cards are written (all three by default).
+    Returns the number of cards generated from real (or sample) data.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if names is None:
+        names = ("stats.svg", "top-langs.svg", "streak.svg")
+    
+    stats_path = os.path.join(output_dir, "stats.svg")
+    langs_path = os.path.join(output_dir, "top-langs.svg")
+    streak_path = os.path.join(output_dir, "streak.svg")
+    
+    success_count = 0
+
+    # Generate stats card
+    if "stats.svg" in names:
+        try:
+            if generate_stats_svg(
+                dataset["user_data"], dataset["total_stars"], dataset["contribution_stats"], stats_path
+            ):
+                success_count += 1
+        except Exception as e:
+            print(f"Error generating stats.svg: {e}")
+            write_placeholder_svg(stats_path, "Stats unavailable")
+
+    # Generate language stats
+    if "top-langs.svg" in names:
+        try:
+            if generate_top_langs_svg(dataset["languages"], langs_path):
+                success_count += 1
+        except Exception as e:
+            print(f"Error generating top-langs.svg: {e}")
+            write_placeholder_svg(langs_path, "Languages unavailable")
+
+    # Generate contributions calendar
+    if "streak.svg" in names:
+        try:
+            contribution_stats = dataset["contribution_stats"] or {}
+            calendar_data = contribution_stats.get("calendar")
+            history = contribution_stats.get("history")
+            streaks = contribution_stats.get("streaks")
+            if generate_streak_svg(calendar_data, streak_path, history, streaks):
+                success_count += 1
+        except Exception as e:
+            print(f"Error generating streak.svg: {e}")
+            write_placeholder_svg(streak_path, "Contributions unavailable")
+
+    return success_count
@@ -0,0 +1,394 @@
+"""Command line interface.
+
+Each subcommand imports only the modules it needs: `render` re-renders
+snapshots without ever loading requests, the HTTP client or asyncio, so
+short-lived processes start quickly. Without a subcommand, `all` is
+assumed, which keeps the original flags working unchanged.
+"""
+
+import argparse
+import os
+import sys
+
+from .config import GITHUB_LOGIN_RE, RUN_METRICS, RUN_REPORT, SNAPSHOT_DIR, get_username
+from .metrics import run_metrics
+from .ratelimit import rate_budget
+from .storage import save_state
+
+COMMANDS = ("all", "fetch", "render", "merge", "bench")
+
+
+def read_usernames(users=None, users_file=None):
+    """Collect usernames from a comma-separated list and/or a file.
+
+    The file holds one username per line; blank lines and lines starting
+    with # are ignored. Duplicates are dropped, keeping the first order, and
+    names that are not valid GitHub logins are skipped with a warning.
+    """
+    names = []
+    if users:
+        names.extend(users.split(","))
+    if users_file:
+        with open(users_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0]
+                names.append(line)
+
+    seen = set()
+    result = []
+    for name in names:
+        name = name.strip()
+        if name and not GITHUB_LOGIN_RE.match(name):
+            print(f"Warning: skipping invalid username {name!r}")
+        elif name and name.lower() not in seen:
+            seen.add(name.lower())
+            result.append(name)
+    return result
+
+
+def parse_shard(value):
+    """Parse a --shard value of the form I/N (0 <= I < N)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected I/N, got {value!r}")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..N-1, got {value!r}")
+    return index, count
+
+
+def parse_args(argv=None):
+    """Parse command line arguments; the subcommand defaults to `all`."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv.insert(0, "all")
+
+    users = argparse.ArgumentParser(add_help=False)
+    users.add_argument("--users", help="comma-separated usernames for batch mode")
+    users.add_argument("--users-file", help="file with one username per line for batch mode")
+
+    run = argparse.ArgumentParser(add_help=False)
+    run.add_argument("--report", default=RUN_REPORT, help="JSON run report path (empty to skip)")
+    run.add_argument("--metrics", default=RUN_METRICS, help="also write Prometheus text metrics here")
+    run.add_argument("--profile", help="write cProfile stats for the run to this file")
+
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument(
+        "--output-dir",
+        default="assets/readme-stats",
+        help="output directory (batch mode writes one subdirectory per user)",
+    )
+    output.add_argument(
+        "--render-workers",
+        type=int,
+        help="render batch cards in this many processes (0 = RENDER_WORKERS or one per CPU)",
+    )
+
+    prog = "python -m readme_stats" if sys.argv[0].endswith("__main__.py") else None
+    parser = argparse.ArgumentParser(prog=prog, description="Generate GitHub README stats SVGs.")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    all_parser = commands.add_parser(
+        "all", parents=[users, output, run], help="fetch data and render cards (default)"
+    )
+    all_parser.add_argument("--workers", type=int, help="users processed concurrently in batch mode")
+    all_parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="fetch and render through the asyncio task graph",
+    )
+    all_parser.add_argument(
+        "--from-snapshot",
+        action="store_true",
+        help="re-render cards from saved snapshots without network access (same as `render`)",
+    )
+    all_parser.add_argument("--serve", action="store_true", help="run an HTTP server rendering cards on demand")
+    all_parser.add_argument("--host", default="127.0.0.1", help="address to bind in server mode")
+    all_parser.add_argument("--port", type=int, default=8080, help="port to listen on in server mode")
+    all_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and regenerate cards as the user's events show changes",
+    )
+    all_parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        metavar="I/N",
+        help="process only shard I of N of the batch users and write a shard status file",
+    )
+    all_parser.add_argument("--manifest", help="JSON file pinning usernames to shards ({username: shard})")
+    all_parser.set_defaults(handler=run_all)
+
+    fetch_parser = commands.add_parser(
+        "fetch", parents=[users, run], help=f"fetch datasets into snapshots ({SNAPSHOT_DIR}) without rendering"
+    )
+    fetch_parser.add_argument("--workers", type=int, help="users fetched concurrently")
+    fetch_parser.set_defaults(handler=run_fetch)
+
+    render_parser = commands.add_parser(
+        "render", parents=[users, output, run], help="render cards from snapshots without network access"
+    )
+    render_parser.set_defaults(handler=run_render)
+
+    merge_parser = commands.add_parser(
+        "merge", parents=[users], help="merge the outputs of a sharded batch and report failures"
+    )
+    merge_parser.add_argument("--shards", type=int, required=True, help="number of shards the batch was split into")
+    merge_parser.add_argument("--manifest", help="JSON file the shards were run with")
+    merge_parser.add_argument(
+        "--output-dir", default="assets/readme-stats", help="directory to merge the cards into"
+    )
+    merge_parser.add_argument(
+        "shard_dirs",
+        nargs="*",
+        help="output directories of the shard workers (default: the output directory)",
+    )
+    merge_parser.set_defaults(handler=run_merge)
+
+    # Arguments after `bench` go to the benchmark's own parser (see main)
+    commands.add_parser("bench", help="benchmark against a local GitHub API stand-in")
+    return parser.parse_args(argv)
+
+
+def get_usernames(args):
+    """Return (batch, usernames) from --users/--users-file or USERNAME."""
+    if args.users or args.users_file:
+        return True, read_usernames(args.users, args.users_file)
+    return False, [get_username()]
+
+
+def run_render(args):
+    """Re-render cards from snapshots; returns (cards generated, cards expected)."""
+    from .snapshot import dataset_from_snapshot, generate_from_snapshot
+
+    batch, usernames = get_usernames(args)
+    run_metrics.info.update(mode="snapshot", users=len(usernames))
+    print(f"\nRendering {len(usernames)} user(s) from snapshots in {SNAPSHOT_DIR}")
+    print("-" * 50)
+
+    if batch and args.render_workers is not None:
+        from .bulk import render_datasets
+
+        def datasets():
+            for username in usernames:
+                dataset = dataset_from_snapshot(username)
+                if dataset is None:
+                    print(f"  No usable snapshot for {username}")
+                else:
+                    yield dataset
+
+        rendered = render_datasets(datasets(), args.output_dir, args.render_workers, total=len(usernames))
+        return sum(rendered.values()), 3 * len(usernames)
+
+    success_count = 0
+    for username in usernames:
+        output_dir = os.path.join(args.output_dir, username) if batch else args.output_dir
+        success_count += generate_from_snapshot(username, output_dir)
+    return success_count, 3 * len(usernames)
+
+
+def run_fetch(args):
+    """Fetch datasets into snapshots; returns (users fetched live, users)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .config import BATCH_WORKERS, FETCH_MODE, get_token
+    from .dataset import fetch_user_dataset
+    from .github import fetch_rate_limit
+
+    if not SNAPSHOT_DIR:
+        print("Error: SNAPSHOT_DIR is empty, so there is nowhere to keep fetched data.")
+        return 0, 0
+
+    token = get_token()
+    fetch_rate_limit(token)
+    _, usernames = get_usernames(args)
+    run_metrics.info.update(mode="fetch", users=len(usernames), fetch_mode=FETCH_MODE)
+    print(f"\nFetching {len(usernames)} user(s) into {SNAPSHOT_DIR}")
+    print("-" * 50)
+
+    def fetch_user(username):
+        try:
+            return fetch_user_dataset(username, token)
+        except Exception as e:
+            print(f"Error fetching data for {username}: {e}")
+            return None
+
+    workers = max(1, min(args.workers or BATCH_WORKERS, len(usernames)))
+    live_count = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for username, dataset in zip(usernames, executor.map(fetch_user, usernames)):
+            sources = (dataset or {}).get("sources") or {}
+            live = [part for part, source in sorted(sources.items()) if source == "live"]
+            if sources and len(live) == len(sources):
+                live_count += 1
+            print(f"  {username}: live {', '.join(live) or 'nothing'}")
+    return live_count, len(usernames)
+
+
+def run_all(args):
+    """Fetch and render (or serve, or watch); returns (cards generated, cards expected)."""
+    if args.from_snapshot:
+        return run_render(args)
+
+    from .config import FETCH_MODE, get_token
+    from .github import fetch_rate_limit
+
+    token = get_token()
+    fetch_rate_limit(token)
+
+    if args.serve:
+        from .server import serve
+        serve(args.host, args.port, token, get_username())
+        return None
+
+    run_metrics.info["fetch_mode"] = FETCH_MODE
+    if args.watch:
+        from .watch import watch
+
+        username = get_username()
+        run_metrics.info.update(mode="watch", users=1)
+        print(f"\nGenerating stats for: {username}")
+        print("-" * 50)
+        success_count = watch(
+            username, token, args.output_dir, lambda: write_run_report(args.report, args.metrics)
+        )
+        return success_count, 3
+
+    if args.shard:
+        from .batch import run_shard
+        from .shard import load_manifest
+
+        if not (args.users or args.users_file):
+            print("Error: --shard needs the batch users from --users or --users-file.")
+            return 0, 0
+        index, count = args.shard
+        # Each shard runs on its own token (and so its own rate limit) when
+        # GITHUB_TOKENS lists several
+        token = get_token(index)
+        fetch_rate_limit(token)
+        usernames = read_usernames(args.users, args.users_file)
+        manifest = load_manifest(args.manifest) if args.manifest else None
+        run_metrics.info.update(mode="shard", shard=f"{index}/{count}", users=len(usernames))
+        print(f"\nGenerating stats for shard {index}/{count} of {len(usernames)} users")
+        print("-" * 50)
+        results = run_shard(
+            usernames, token, args.output_dir, args.shard, manifest, args.workers, args.render_workers
+        )
+        return sum(results.values()), 3 * len(results)
+
+    if args.users or args.users_file:
+        from .batch import run_batch
+
+        usernames = read_usernames(args.users, args.users_file)
+        run_metrics.info.update(mode="batch", users=len(usernames))
+        print(f"\nGenerating stats for {len(usernames)} users")
+        print("-" * 50)
+        results = run_batch(usernames, token, args.output_dir, args.workers, args.render_workers)
+        return sum(results.values()), 3 * len(results)
+
+    username = get_username()
+    run_metrics.info.update(mode="async" if args.use_async else "single", users=1)
+    print(f"\nGenerating stats for: {username}")
+    print("-" * 50)
+    if args.use_async:
+        import asyncio
+
+        from .dataset import generate_user_cards_async
+        return asyncio.run(generate_user_cards_async(username, token, args.output_dir)), 3
+
+    from .dataset import generate_user_cards
+    return generate_user_cards(username, token, args.output_dir), 3
+
+
+def run_merge(args):
+    """Merge the outputs of a sharded batch and print its report."""
+    from .shard import load_manifest, merge_shards
+
+    usernames = read_usernames(args.users, args.users_file) if args.users or args.users_file else None
+    manifest = load_manifest(args.manifest) if args.manifest else None
+    summary = merge_shards(args.output_dir, args.shards, args.shard_dirs, usernames, manifest)
+
+    print(f"\nMerged {args.shards} shard(s) into {args.output_dir}")
+    print("-" * 50)
+    for index, state in summary["shards"].items():
+        print(f"  Shard {index}: {state}")
+    print(f"  Users complete: {summary['complete']}/{summary['users']}")
+    for name, attempts in sorted(summary["retried"].items()):
+        print(f"  Retried: {name} ({attempts} attempts)")
+    for name in summary["failed"]:
+        print(f"  Failed: {name}")
+    for name, shard in summary["not_run"].items():
+        print(f"  Not run: {name} (shard {shard})")
+    if summary["retry"]:
+        print(f"  Retry list: {os.path.join(args.output_dir, '.shards', 'retry-users.txt')}")
+    return None
+
+
+def write_run_report(report_path, metrics_path=None):
+    """Write the JSON run report and, optionally, Prometheus text metrics."""
+    report = run_metrics.report()
+    if report_path:
+        try:
+            save_state(report_path, report)
+            print(f"  Run report: {report_path}")
+        except OSError as e:
+            print(f"  Warning: could not write run report: {e}")
+    if metrics_path:
+        try:
+            directory = os.path.dirname(metrics_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Textfile collectors may read at any time, so replace atomically
+            tmp_path = f"{metrics_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(run_metrics.prometheus_text(report))
+            os.replace(tmp_path, metrics_path)
+            print(f"  Metrics: {metrics_path}")
+        except OSError as e:
+            print(f"  Warning: could not write metrics: {e}")
+
+
+def main(argv=None):
+    """Main function to generate all stats SVGs."""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["bench"]:
+        from .bench import main as bench_main
+        return bench_main(argv[1:])
+    args = parse_args(argv)
+
+    print("=" * 50)
+    print("GitHub README Stats Generator")
+    print("=" * 50)
+
+    profiler = None
+    if getattr(args, "profile", None):
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    counts = args.handler(args)
+    if counts is None:
+        return 0
+    if args.command == "fetch":
+        return finish_run(args, profiler, *counts, summary="Fetch complete: {0}/{1} users fetched live")
+    return finish_run(args, profiler, *counts)
+
+
+def finish_run(args, profiler, success_count, total_count,
+               summary="Generation complete: {0}/{1} SVGs generated successfully"):
+    """Stop profiling, print the summary and write the run report."""
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+    run_metrics.info.update(cards_generated=success_count, cards_total=total_count)
+
+    print("\n" + "=" * 50)
+    print(summary.format(success_count, total_count))
+    for line in rate_budget.summary():
+        print(f"  Rate limit: {line}")
+    write_run_report(args.report, args.metrics)
+    print("=" * 50)
+
+    # Always exit with 0 to not fail the workflow
+    return 0
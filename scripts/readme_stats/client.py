@@ -0,0 +1,383 @@
+"""HTTP access to the GitHub API: session, retries, caching."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import (
+    GITHUB_API_BASE,
+    GITHUB_GRAPHQL_URL,
+    HTTP_BACKOFF_BASE,
+    HTTP_CACHE_DIR,
+    HTTP_CACHE_MAX_BYTES,
+    HTTP_CACHE_SCOPE,
+    HTTP_CACHE_TTL,
+    HTTP_MAX_IN_FLIGHT,
+    HTTP_MAX_RETRIES,
+    HTTP_MAX_RETRY_WAIT,
+    HTTP_POOL_SIZE,
+    HTTP_RETRY_STATUSES,
+    HTTP_TIMEOUT,
+)
+from .metrics import run_metrics
+from .ratelimit import rate_budget
+
+
+_session = None
+_session_lock = threading.Lock()
+_request_slots = threading.BoundedSemaphore(max(1, HTTP_MAX_IN_FLIGHT))
+
+
+def get_session():
+    """Return the shared HTTP session, creating it on first use.
+
+    A single session keeps connections to api.github.com alive across
+    requests, so only the first call pays for the TCP and TLS handshake.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_SIZE,
+                    pool_maxsize=HTTP_POOL_SIZE,
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = "readme-stats-generator"
+                _session = session
+    return _session
+
+
+def is_retryable_response(response):
+    """Check whether a response is worth retrying."""
+    if response.status_code in HTTP_RETRY_STATUSES:
+        return True
+    # GitHub answers 403 for both primary and secondary rate limits
+    if response.status_code == 403:
+        return (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+        )
+    return False
+
+
+def get_retry_delay(response, attempt):
+    """Work out how long to wait before the next attempt.
+
+    Honors Retry-After and X-RateLimit-Reset when the server sends them,
+    otherwise backs off exponentially.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return max(0.0, retry_at.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset and response.headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                return max(0.0, int(reset) - time.time()) + 1
+            except ValueError:
+                pass
+
+    return HTTP_BACKOFF_BASE * (2 ** attempt)
+
+
+class RateLimitExceeded(requests.RequestException):
+    """Raised instead of sending a request the rate limit would reject."""
+
+
+def http_request(method, url, **kwargs):
+    """Send a request through the shared session, retrying transient failures.
+
+    Returns the final response (which may still be an error status) or
+    raises requests.RequestException if the connection keeps failing.
+    Raises RateLimitExceeded without sending if the budget is exhausted.
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    session = get_session()
+    resource = "graphql" if url == GITHUB_GRAPHQL_URL else "core"
+
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        rate_budget.before_request(resource)
+        response = None
+        start = time.perf_counter()
+        try:
+            with _request_slots:
+                response = session.request(method, url, **kwargs)
+            rate_budget.update_from_headers(response.headers)
+        except (requests.ConnectionError, requests.Timeout):
+            run_metrics.record_request(url, None, time.perf_counter() - start, 0, attempt > 0)
+            if attempt == HTTP_MAX_RETRIES:
+                raise
+        else:
+            run_metrics.record_request(
+                url, response.status_code, time.perf_counter() - start, len(response.content), attempt > 0
+            )
+            if attempt == HTTP_MAX_RETRIES or not is_retryable_response(response):
+                return response
+
+        delay = get_retry_delay(response, attempt)
+        if delay > HTTP_MAX_RETRY_WAIT:
+            # Waiting for a rate limit reset an hour away is not useful here
+            if response is None:
+                raise requests.ConnectionError(f"Giving up on {url}")
+            return response
+
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+
+    return response
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of validated GET responses stored on disk.
+
+    Each entry is a JSON file holding the response body and its ETag and
+    Last-Modified validators. Entries older than `ttl` seconds are dropped;
+    when the directory grows past `max_bytes` the least recently used
+    entries (by file mtime) are evicted.
+    """
+
+    def __init__(self, directory, ttl=HTTP_CACHE_TTL, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(url, token=None):
+        """Build a cache key from the URL and the auth scope (not the token)."""
+        scope = HTTP_CACHE_SCOPE or ("authenticated" if token else "anonymous")
+        return hashlib.sha256(f"{scope}\n{url}".encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return the cached entry for `key`, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("stored_at", 0) > self.ttl:
+            self.delete(key)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key, entry):
+        """Store `entry` under `key`, evicting old entries if over budget."""
+        entry = dict(entry, stored_at=time.time())
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        data = json.dumps(entry, separators=(",", ":")).encode("utf-8")
+
+        with self._lock:
+            total = self._get_total_bytes()
+            try:
+                total -= os.path.getsize(path)
+            except OSError:
+                pass
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._total_bytes = total + len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def delete(self, key):
+        """Remove the entry for `key` if present."""
+        with self._lock:
+            try:
+                size = os.path.getsize(self._path(key))
+                os.remove(self._path(key))
+            except OSError:
+                return
+            if self._total_bytes is not None:
+                self._total_bytes -= size
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _get_total_bytes(self):
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._entries())
+        return self._total_bytes
+
+    def _evict(self):
+        """Drop least recently used entries until under 90% of the budget."""
+        target = self.max_bytes * 0.9
+        total = self._total_bytes
+        for _, size, name in sorted(self._entries()):
+            if total <= target:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
+
+
+_response_cache = None
+
+
+def get_response_cache():
+    """Return the shared response cache, or None if caching is disabled."""
+    global _response_cache
+    if _response_cache is None and HTTP_CACHE_DIR:
+        with _session_lock:
+            if _response_cache is None:
+                try:
+                    _response_cache = ResponseCache(HTTP_CACHE_DIR)
+                except OSError as e:
+                    print(f"Warning: HTTP cache disabled ({e})")
+                    return None
+    return _response_cache
+
+
+def get_json(url, token=None):
+    """GET a GitHub API URL and decode the JSON body.
+
+    Responses carrying an ETag or Last-Modified header are cached on disk
+    and revalidated with a conditional request on the next call; a 304
+    reply is served from the cache. Raises requests.RequestException on
+    failure.
+    """
+    return get_json_page(url, token)[0]
+
+
+def get_json_page(url, token=None):
+    """Like get_json(), but also return the Link header as a {rel: url} dict."""
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+
+    cache = get_response_cache()
+    key = ResponseCache.make_key(url, token) if cache else None
+    entry = cache.get(key) if cache else None
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = http_request("GET", url, headers=headers)
+    except RateLimitExceeded:
+        if not entry:
+            raise
+        rate_budget.count("cache_fallback")
+        run_metrics.count_cache("fallback")
+        return entry["body"], entry.get("links", {})
+
+    if response.status_code == 304 and entry:
+        run_metrics.count_cache("hit")
+        return entry["body"], entry.get("links", {})
+
+    if response.status_code in (403, 429) and entry:
+        # Rate limited: an older copy beats no data at all
+        rate_budget.count("cache_fallback")
+        run_metrics.count_cache("fallback")
+        return entry["body"], entry.get("links", {})
+
+    response.raise_for_status()
+    body = response.json()
+    links = {rel: link["url"] for rel, link in response.links.items()}
+
+    if cache:
+        run_metrics.count_cache("changed" if entry else "miss")
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            cache.set(key, {
+                "etag": etag,
+                "last_modified": last_modified,
+                "links": links,
+                "body": body,
+            })
+    return body, links
+
+
+def make_rest_request(endpoint, token=None):
+    """Make a REST API request to GitHub."""
+    return make_rest_page_request(endpoint, token)[0]
+
+
+def make_rest_page_request(endpoint, token=None):
+    """Make a REST API request, returning the body and its Link relations."""
+    url = f"{GITHUB_API_BASE}{endpoint}"
+    
+    try:
+        return get_json_page(url, token)
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error fetching {endpoint}: {e}")
+        return None, {}
+
+
+def make_graphql_request(query, token, variables=None):
+    """Make a GraphQL request to GitHub."""
+    if not token:
+        print("Error: GraphQL API requires authentication.")
+        return None
+    
+    headers = {
+        "Authorization": f"bearer {token}",
+        "Content-Type": "application/json",
+    }
+    
+    payload = {"query": query}
+    if variables:
+        payload["variables"] = variables
+    
+    try:
+        response = http_request(
+            "POST",
+            GITHUB_GRAPHQL_URL,
+            json=payload,
+            headers=headers,
+        )
+        response.raise_for_status()
+        data = response.json()
+        if "errors" in data:
+            print(f"GraphQL errors: {data['errors']}")
+            return None
+        return data
+    except requests.RequestException as e:
+        print(f"Error making GraphQL request: {e}")
+        return None
@@ -0,0 +1,270 @@
+"""Settings read from the environment, themes and static data."""
+
+import os
+import re
+
+# Configuration (GitHub Actions sets both variables; overriding them
+# points the script at GitHub Enterprise or a local stand-in server)
+GITHUB_API_BASE = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_GRAPHQL_URL = os.environ.get("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+
+# HTTP transport settings
+HTTP_TIMEOUT = 30
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", "32"))
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_BASE = 1.0
+HTTP_MAX_RETRY_WAIT = 120  # Never sleep longer than this for a single retry
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Requests allowed in flight at once across every user and worker thread
+HTTP_MAX_IN_FLIGHT = int(os.environ.get("HTTP_MAX_IN_FLIGHT", "16"))
+
+# Rate limit budgeting: requests kept in reserve, the fraction of the hourly
+# limit below which requests are spaced out, and the longest pause per request
+RATE_LIMIT_RESERVE = int(os.environ.get("RATE_LIMIT_RESERVE", "50"))
+RATE_LIMIT_THROTTLE_FRACTION = 0.1
+RATE_LIMIT_MAX_THROTTLE = 2.0
+
+# On-disk HTTP response cache. Cached GET responses are revalidated with
+# If-None-Match/If-Modified-Since; GitHub does not count 304s against the
+# rate limit. Set HTTP_CACHE_DIR to an empty string to disable.
+HTTP_CACHE_DIR = os.environ.get("HTTP_CACHE_DIR", ".cache/readme-stats/http")
+HTTP_CACHE_TTL = int(os.environ.get("HTTP_CACHE_TTL", str(14 * 24 * 3600)))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Cache entries are keyed on who is asking, not on the token itself: Actions
+# mints a new GITHUB_TOKEN per job. Set HTTP_CACHE_SCOPE to keep tokens that
+# see different data (e.g. private repos) apart.
+HTTP_CACHE_SCOPE = os.environ.get("HTTP_CACHE_SCOPE", "")
+
+# Local state kept between runs (incremental language totals, etc.)
+STATE_DIR = os.environ.get("STATE_DIR", ".cache/readme-stats/state")
+LANGUAGE_STATE_VERSION = 1
+
+# Number of repos whose languages are fetched at the same time. Kept small
+# so bursts stay under GitHub's secondary rate limits; set to 1 for serial.
+LANGUAGE_WORKERS = int(os.environ.get("LANGUAGE_WORKERS", "8"))
+
+# Repository list pages requested at once once the page count is known
+REPOS_PER_PAGE = 100
+REPO_PAGE_WORKERS = int(os.environ.get("REPO_PAGE_WORKERS", "4"))
+
+# Users processed at the same time in batch mode
+BATCH_WORKERS = int(os.environ.get("BATCH_WORKERS", "4"))
+
+# Valid GitHub logins; usernames also become output directory names
+GITHUB_LOGIN_RE = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$")
+
+# Bulk rendering (--render-workers): processes used to render batch cards
+# (0 means one per CPU) and users handed to a process at a time
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", "0"))
+RENDER_CHUNK_SIZE = int(os.environ.get("RENDER_CHUNK_SIZE", "32"))
+
+# Sharded batch (--shard I/N): each worker renders only the users that
+# hash to shard I (or that a --manifest pins there), runs users whose data
+# was not fully live up to SHARD_RETRIES more times, and leaves a status
+# file in <output-dir>/SHARD_STATUS_DIR for `merge` to collect
+SHARD_RETRIES = int(os.environ.get("SHARD_RETRIES", "1"))
+SHARD_STATUS_DIR = ".shards"
+
+# Render service (--serve): how long a user's data stays fresh, how much
+# longer a stale copy may be served while it is refreshed in the
+# background, and how many users are kept in memory
+SERVER_CACHE_TTL = int(os.environ.get("SERVER_CACHE_TTL", "1800"))
+SERVER_STALE_TTL = int(os.environ.get("SERVER_STALE_TTL", "86400"))
+SERVER_CACHE_SIZE = int(os.environ.get("SERVER_CACHE_SIZE", "256"))
+# Data from a snapshot or samples (the upstream fetch failed) is only kept
+# this long, with no stale window, so the next request retries soon
+SERVER_FALLBACK_TTL = int(os.environ.get("SERVER_FALLBACK_TTL", "60"))
+
+# Watch mode (--watch): the user's events and profile are polled with
+# conditional requests every WATCH_INTERVAL seconds (never faster than
+# GitHub's X-Poll-Interval), backing off to WATCH_MAX_INTERVAL while
+# nothing happens. Stars received never show up in a user's own events,
+# so they are recounted every WATCH_STARS_INTERVAL seconds instead.
+WATCH_INTERVAL = int(os.environ.get("WATCH_INTERVAL", "60"))
+WATCH_MAX_INTERVAL = int(os.environ.get("WATCH_MAX_INTERVAL", "900"))
+WATCH_STARS_INTERVAL = int(os.environ.get("WATCH_STARS_INTERVAL", "3600"))
+
+# Streak history: "year" uses the default one-year calendar, "full" merges
+# every contribution year (past years are cached in STATE_DIR for good)
+STREAK_HISTORY = os.environ.get("STREAK_HISTORY", "year")
+CONTRIBUTION_WORKERS = int(os.environ.get("CONTRIBUTION_WORKERS", "4"))
+CONTRIBUTION_HISTORY_VERSION = 1
+
+# Calendar refresh: "full" re-downloads the year every run, "incremental"
+# keeps the calendar in STATE_DIR and only fetches the trailing
+# CALENDAR_REFRESH_DAYS (older days are treated as final)
+CALENDAR_REFRESH = os.environ.get("CALENDAR_REFRESH", "full")
+CALENDAR_REFRESH_DAYS = int(os.environ.get("CALENDAR_REFRESH_DAYS", "3"))
+CALENDAR_STATE_VERSION = 2
+
+# Heatmap markup: "compact" groups the day cells by color and draws each
+# with a <use> of one shared cell; "rects" writes a full <rect> per day.
+# With WRITE_SVGZ=1 every card also gets a gzip-compressed .svgz copy.
+HEATMAP_STYLE = os.environ.get("HEATMAP_STYLE", "compact")
+WRITE_SVGZ = os.environ.get("WRITE_SVGZ", "0") == "1"
+
+# Run report: a JSON summary of stage timings, HTTP calls, cache outcomes
+# and rate limits is written to RUN_REPORT after each run ("" disables);
+# RUN_METRICS optionally names a Prometheus textfile with the same numbers
+RUN_REPORT = os.environ.get("RUN_REPORT", ".cache/readme-stats/run-report.json")
+RUN_METRICS = os.environ.get("RUN_METRICS", "")
+
+# Snapshots: each user's last good dataset (profile, repo summary, language
+# totals, calendar) is kept here as gzipped JSON. Parts that cannot be
+# fetched fall back to it before sample data, and --from-snapshot
+# re-renders from it without network access. Set to "" to disable.
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", ".cache/readme-stats/snapshots")
+SNAPSHOT_VERSION = 1
+
+# How data is fetched: "graphql" batches everything into a few queries,
+# "rest" uses one request per repo, "auto" tries GraphQL when a token is set.
+FETCH_MODE = os.environ.get("STATS_FETCH_MODE", "auto")
+
+# Languages requested per repo in GraphQL mode (largest first); repos with
+# more are paged through separately so the totals stay complete
+GRAPHQL_LANGUAGES_PER_REPO = 10
+
+# Languages card: how many languages to show, whether to lump the rest into
+# an "Other" row, languages to leave out entirely (comma-separated, e.g.
+# "HTML,Jupyter Notebook") and the byte count below which a language is
+# ignored. Percentages are shares of everything that remains.
+TOP_LANGUAGES = int(os.environ.get("TOP_LANGUAGES", "6"))
+LANGUAGE_OTHER = os.environ.get("LANGUAGE_OTHER", "0") == "1"
+LANGUAGE_EXCLUDE = {
+    name.strip().lower() for name in os.environ.get("LANGUAGE_EXCLUDE", "").split(",") if name.strip()
+}
+LANGUAGE_MIN_BYTES = int(os.environ.get("LANGUAGE_MIN_BYTES", "0"))
+
+# Card color themes; STATS_THEME picks the default. "contrib" recolors the
+# heatmap with a 5-level ramp (None keeps the colors GitHub sends).
+THEMES = {
+    "radical": {
+        "bg": "#1a1a2e",
+        "bg_end": "#16213e",
+        "border": "#fe428e",
+        "title": "#fe428e",
+        "text": "#ffffff",
+        "subtitle": "#a9fef7",
+        "icon": "#f8d847",
+        "muted": "#8b949e",
+        "hint": "#888888",
+        "track": "#2d2d44",
+        "contrib": None,
+    },
+    "github-dark": {
+        "bg": "#0d1117",
+        "bg_end": "#161b22",
+        "border": "#30363d",
+        "title": "#58a6ff",
+        "text": "#c9d1d9",
+        "subtitle": "#79c0ff",
+        "icon": "#e3b341",
+        "muted": "#8b949e",
+        "hint": "#8b949e",
+        "track": "#21262d",
+        "contrib": ["#161b22", "#0e4429", "#006d32", "#26a641", "#39d353"],
+    },
+    "github-light": {
+        "bg": "#ffffff",
+        "bg_end": "#f6f8fa",
+        "border": "#d0d7de",
+        "title": "#0969da",
+        "text": "#24292f",
+        "subtitle": "#0550ae",
+        "icon": "#bf8700",
+        "muted": "#57606a",
+        "hint": "#6e7781",
+        "track": "#eaeef2",
+        "contrib": ["#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39"],
+    },
+}
+THEME = os.environ.get("STATS_THEME", "radical")
+if THEME not in THEMES:
+    print(f"Warning: unknown STATS_THEME {THEME!r}, using radical")
+    THEME = "radical"
+
+# Language colors (common languages)
+LANG_COLORS = {
+    "Python": "#3572A5",
+    "JavaScript": "#f1e05a",
+    "TypeScript": "#2b7489",
+    "HTML": "#e34c26",
+    "CSS": "#563d7c",
+    "Java": "#b07219",
+    "C++": "#f34b7d",
+    "C": "#555555",
+    "C#": "#178600",
+    "Go": "#00ADD8",
+    "Rust": "#dea584",
+    "Ruby": "#701516",
+    "PHP": "#4F5D95",
+    "Swift": "#ffac45",
+    "Kotlin": "#F18E33",
+    "Shell": "#89e051",
+    "Jupyter Notebook": "#DA5B0B",
+    "MATLAB": "#e16737",
+    "R": "#198CE7",
+    "Scala": "#c22d40",
+}
+
+# Sample data used when API access fails (e.g., offline execution)
+SAMPLE_LANGUAGES = [
+    {"name": "Python", "percentage": 38.5, "color": LANG_COLORS["Python"]},
+    {"name": "JavaScript", "percentage": 24.0, "color": LANG_COLORS["JavaScript"]},
+    {"name": "TypeScript", "percentage": 15.5, "color": LANG_COLORS["TypeScript"]},
+    {"name": "HTML", "percentage": 10.0, "color": LANG_COLORS["HTML"]},
+    {"name": "CSS", "percentage": 7.0, "color": LANG_COLORS["CSS"]},
+    {"name": "Jupyter Notebook", "percentage": 5.0, "color": LANG_COLORS["Jupyter Notebook"]},
+]
+
+# Contribution calendar colors (5-level ramp)
+CONTRIB_COLORS = ["#161b22", "#0e4429", "#006d32", "#26a641", "#39d353"]
+
+# GitHub's own heatmap ramps, used to map an API day color back to its level
+GITHUB_CONTRIB_LEVELS = {
+    color.lower(): level
+    for ramp in (CONTRIB_COLORS, THEMES["github-light"]["contrib"])
+    for level, color in enumerate(ramp)
+}
+
+# Text styles shared by the cards; each card's <style> holds only its own
+CARD_STYLES = {
+    "title": "fill:{title};font-size:18px;font-weight:bold",
+    "icon": "fill:{icon};font-size:14px",
+    "label": "fill:{text};font-size:14px",
+    "value": "fill:{subtitle};font-size:14px;font-weight:bold",
+    "name": "fill:{text};font-size:12px",
+    "pct": "fill:{subtitle};font-size:12px;text-anchor:end",
+    "heading": "fill:{title};font-size:14px;font-weight:bold;text-anchor:middle",
+    "sub": "fill:{subtitle};font-size:12px;text-anchor:middle",
+    "muted": "fill:{muted};font-size:10px",
+    "note": "fill:{text};font-size:11px;text-anchor:middle",
+    "msg": "fill:{text};font-size:16px;text-anchor:middle;dominant-baseline:middle",
+    "hint": "fill:{hint};font-size:12px;text-anchor:middle;dominant-baseline:middle",
+}
+CARD_CLASSES = {
+    "placeholder": ("msg", "hint"),
+    "stats": ("title", "icon", "label", "value"),
+    "langs": ("title", "name", "pct"),
+    "streak": ("heading", "sub", "muted", "note"),
+}
+
+
+def get_token(shard=None):
+    """Get GitHub token from environment.
+
+    With GITHUB_TOKENS set (comma-separated), shard I of a sharded batch
+    uses token I modulo their count, so each worker has its own budget.
+    """
+    tokens = [token.strip() for token in os.environ.get("GITHUB_TOKENS", "").split(",") if token.strip()]
+    if tokens and shard is not None:
+        return tokens[shard % len(tokens)]
+    token = os.environ.get("GITHUB_TOKEN")
+    if not token:
+        print("Warning: GITHUB_TOKEN not set. API calls may be rate-limited.")
+    return token
+
+
+def get_username():
+    """Get username from environment or use default."""
+    return os.environ.get("USERNAME", "rabrie10")
@@ -0,0 +1,256 @@
+"""Contribution calendars, heatmap levels, streaks and the packed calendar form."""
+
+from array import array
+from datetime import date, datetime, timedelta
+
+from .config import CONTRIB_COLORS, GITHUB_CONTRIB_LEVELS
+
+
+def get_contrib_color(count):
+    """Get color for contribution count."""
+    if count == 0:
+        return CONTRIB_COLORS[0]
+    elif count <= 3:
+        return CONTRIB_COLORS[1]
+    elif count <= 6:
+        return CONTRIB_COLORS[2]
+    elif count <= 9:
+        return CONTRIB_COLORS[3]
+    else:
+        return CONTRIB_COLORS[4]
+
+
+def get_contrib_level(count, color=None):
+    """Heatmap level (0-4) of a day, from GitHub's color when it is known."""
+    level = GITHUB_CONTRIB_LEVELS.get((color or "").lower())
+    if level is not None:
+        return level
+    return CONTRIB_COLORS.index(get_contrib_color(count))
+
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class ContributionCalendar:
+    """Compact daily contribution counts.
+
+    Days are stored as a dense array('H') of counts indexed by days since
+    `start` (a proleptic Gregorian ordinal), so each date string is parsed
+    exactly once and no sorting is needed. Days missing from the source
+    count as zero. `week_starts` keeps the ordinal of the first day of each
+    source week (0 if unknown) for placing month labels.
+    """
+
+    __slots__ = ("start", "counts", "week_starts")
+
+    def __init__(self, start, counts, week_starts=None):
+        self.start = start
+        self.counts = counts
+        self.week_starts = week_starts if week_starts is not None else array("l")
+
+    @classmethod
+    def from_calendar_data(cls, calendar_data):
+        """Build a calendar from a GraphQL contributionCalendar dict."""
+        days = []
+        week_starts = array("l")
+        for week in (calendar_data or {}).get("weeks", []):
+            first = 0
+            for day in week.get("contributionDays", []):
+                try:
+                    ordinal = date.fromisoformat(day.get("date") or "").toordinal()
+                except ValueError:
+                    continue
+                if not first:
+                    first = ordinal
+                days.append((ordinal, day.get("contributionCount", 0)))
+            week_starts.append(first)
+
+        if not days:
+            return cls(0, array("H"), week_starts)
+
+        start = min(ordinal for ordinal, _ in days)
+        counts = array("H", bytes(2 * (max(ordinal for ordinal, _ in days) - start + 1)))
+        for ordinal, count in days:
+            counts[ordinal - start] = min(count, 0xFFFF)
+        return cls(start, counts, week_starts)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a calendar saved with to_dict()."""
+        return cls(data["start"], array("H", data["counts"]))
+
+    def to_dict(self):
+        """Serialize the day counts (not the week layout) to plain types."""
+        return {"start": self.start, "counts": self.counts.tolist()}
+
+    @classmethod
+    def merge(cls, calendars):
+        """Combine calendars into one spanning all of them.
+
+        Later calendars win where they overlap; gaps count as zero.
+        """
+        calendars = [calendar for calendar in calendars if calendar and len(calendar)]
+        if not calendars:
+            return cls(0, array("H"))
+
+        start = min(calendar.start for calendar in calendars)
+        end = max(calendar.end for calendar in calendars)
+        counts = array("H", bytes(2 * (end - start + 1)))
+        for calendar in calendars:
+            offset = calendar.start - start
+            counts[offset:offset + len(calendar)] = calendar.counts
+        return cls(start, counts, calendars[-1].week_starts)
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def end(self):
+        """Ordinal of the last day covered."""
+        return self.start + len(self.counts) - 1
+
+    def total(self):
+        """Total contributions across all days."""
+        return sum(self.counts)
+
+    def streaks(self):
+        """Current and longest streaks plus active days, in one pass.
+
+        Works on a byte string of active flags so the scanning happens in
+        C: runs of active days are the pieces between zero bytes.
+        """
+        if not self.counts:
+            return {"current": 0, "longest": 0, "active_days": 0}
+
+        flags = bytes(map(bool, self.counts))
+        runs = flags.split(b"\x00")
+        return {
+            "current": len(runs[-1]),
+            "longest": max(map(len, runs)),
+            "active_days": len(flags) - flags.count(0),
+        }
+
+    def month_labels(self):
+        """(week index, month name) pairs for weeks that start a new month.
+
+        A month is labelled at the first week whose first day falls within
+        the month's first seven days.
+        """
+        labels = []
+        seen = set()
+        for week_idx, ordinal in enumerate(self.week_starts):
+            if not ordinal:
+                continue
+            day = date.fromordinal(ordinal)
+            key = (day.year, day.month)
+            if day.day <= 7 and key not in seen:
+                seen.add(key)
+                labels.append((week_idx, MONTH_NAMES[day.month - 1]))
+        return labels
+
+
+def calculate_streaks(calendar_data):
+    """Calculate current and longest contribution streaks.
+
+    Accepts either a contributionCalendar dict or a ContributionCalendar.
+    """
+    if not isinstance(calendar_data, ContributionCalendar):
+        calendar_data = ContributionCalendar.from_calendar_data(calendar_data)
+    return calendar_data.streaks()
+
+
+def build_sample_contributions(username):
+    """Provide sample contribution stats to use when API data is unavailable."""
+    today = datetime.utcnow().date()
+
+    weeks = []
+    for week_offset in range(20):
+        contribution_days = []
+        for day_idx in range(7):
+            date = today - timedelta(days=week_offset * 7 + day_idx)
+            count = max(0, (day_idx * 2 - week_offset) % 10)
+            contribution_days.append(
+                {
+                    "date": date.strftime("%Y-%m-%d"),
+                    "contributionCount": count,
+                    "color": get_contrib_color(count),
+                }
+            )
+
+        weeks.append({"contributionDays": list(reversed(contribution_days))})
+
+    weeks.reverse()
+
+    return {
+        "calendar": {
+            "totalContributions": sum(
+                day["contributionCount"] for week in weeks for day in week["contributionDays"]
+            ),
+            "weeks": weeks,
+        },
+        "commits": 120,
+        "pull_requests": 24,
+        "issues": 14,
+        "reviews": 18,
+        "login": username,
+    }
+
+
+def pack_calendar(calendar_data):
+    """Pack a contributionCalendar dict whose days are consecutive.
+
+    Returns (first date, total, counts, color indexes, palette, week
+    lengths), or the dict unchanged when its days have gaps.
+    """
+    if not calendar_data or not calendar_data.get("weeks"):
+        return calendar_data
+
+    counts = array("H")
+    colors = bytearray()
+    palette = []
+    week_lengths = bytearray()
+    first = previous = None
+    for week in calendar_data["weeks"]:
+        days = week.get("contributionDays", [])
+        week_lengths.append(len(days))
+        for day in days:
+            ordinal = date.fromisoformat(day["date"]).toordinal()
+            if previous is not None and ordinal != previous + 1:
+                return calendar_data
+            first = first or ordinal
+            previous = ordinal
+            color = day.get("color") or ""
+            if color not in palette:
+                palette.append(color)
+            if len(palette) > 255:
+                return calendar_data
+            counts.append(min(day.get("contributionCount", 0), 0xFFFF))
+            colors.append(palette.index(color))
+
+    total = calendar_data.get("totalContributions", sum(counts))
+    return (first, total, counts.tobytes(), bytes(colors), tuple(palette), bytes(week_lengths))
+
+
+def unpack_calendar(packed):
+    """Inverse of pack_calendar()."""
+    if not isinstance(packed, tuple):
+        return packed
+
+    first, total, count_bytes, colors, palette, week_lengths = packed
+    counts = array("H")
+    counts.frombytes(count_bytes)
+    weeks = []
+    index = 0
+    for length in week_lengths:
+        days = []
+        for _ in range(length):
+            day = {
+                "date": date.fromordinal(first + index).isoformat(),
+                "contributionCount": counts[index],
+            }
+            if palette[colors[index]]:
+                day["color"] = palette[colors[index]]
+            days.append(day)
+            index += 1
+        weeks.append({"contributionDays": days})
+    return {"totalContributions": total, "weeks": weeks}
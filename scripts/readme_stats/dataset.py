@@ -0,0 +1,302 @@
+"""Fetching a user's full dataset and writing their cards."""
+
+import asyncio
+import math
+import os
+
+from .cards import (
+    generate_stats_svg,
+    generate_streak_svg,
+    generate_top_langs_svg,
+    write_placeholder_svg,
+    write_user_cards,
+)
+from .config import CALENDAR_REFRESH, FETCH_MODE, STATE_DIR, STREAK_HISTORY
+from .contributions import ContributionCalendar, build_sample_contributions
+from .github import (
+    aggregate_language_totals,
+    fetch_contribution_history,
+    fetch_contributions_data,
+    fetch_star_metrics,
+    fetch_stats_graphql,
+    fetch_user_data,
+    get_language_state_path,
+    refresh_contributions,
+    stream_repos,
+)
+from .metrics import run_metrics
+from .ratelimit import rate_budget
+from .snapshot import (
+    decode_contributions,
+    load_snapshot_part,
+    resolve_languages,
+    resolve_total_stars,
+    resolve_user_data,
+    save_snapshot,
+)
+
+
+def report_rest_estimate(user_data):
+    """Print the estimated REST cost of a user's run against the budget."""
+    public_repos = (user_data or {}).get("public_repos", 0)
+    # Repo pages plus, at worst, one language lookup per repo
+    estimate = math.ceil(public_repos / 100) + public_repos
+    available = rate_budget.available("core")
+    if available is None:
+        print(f"  Estimated cost: up to {estimate} REST requests")
+        return
+    print(f"  Estimated cost: up to {estimate} REST requests, {available} available")
+    if estimate > available:
+        rate_budget.note(
+            f"estimated {estimate} requests exceeds the {available} available; "
+            "cached data and incremental state will cover the rest"
+        )
+
+
+@run_metrics.stage("fetch.contributions")
+def fetch_contribution_stats(username, token, contribution_stats=None, sources=None):
+    """Complete contribution stats for a user, with snapshot/sample fallback.
+
+    `contribution_stats` is whatever the main fetch already produced (the
+    GraphQL stats query includes it); the calendar is fetched or refreshed
+    as configured and, with STREAK_HISTORY=full, the history is attached.
+    Where the data came from is recorded in `sources["contributions"]`.
+    """
+    if sources is None:
+        sources = {}
+    try:
+        if token and CALENDAR_REFRESH == "incremental":
+            try:
+                refreshed = refresh_contributions(username, token, contribution_stats)
+            except Exception as e:
+                print(f"Error refreshing contributions: {e}")
+                refreshed = None
+            contribution_stats = refreshed or fetch_contributions_data(username, token)
+        elif contribution_stats is None:
+            contribution_stats = fetch_contributions_data(username, token)
+    except Exception as e:
+        print(f"Error fetching contribution stats: {e}")
+        contribution_stats = None
+
+    if contribution_stats is None:
+        part = load_snapshot_part(username, "contributions")
+        if part:
+            print("  Using contribution data from the last good snapshot.")
+            sources["contributions"] = "snapshot"
+            return decode_contributions(part)
+        print("  Using sample contribution data.")
+        sources["contributions"] = "sample"
+        return build_sample_contributions(username)
+
+    sources["contributions"] = "live"
+
+    if (
+        token
+        and STREAK_HISTORY == "full"
+        and contribution_stats.get("calendar")
+        and "history" not in contribution_stats
+    ):
+        try:
+            recent = ContributionCalendar.from_calendar_data(contribution_stats["calendar"])
+            contribution_stats["history"] = fetch_contribution_history(username, token, recent)
+        except Exception as e:
+            print(f"Error fetching contribution history: {e}")
+    return contribution_stats
+
+
+@run_metrics.stage("fetch.languages")
+def fetch_languages(username, repos, token, listing=None):
+    """Language byte totals for a user's repos (None if they cannot be fetched)."""
+    try:
+        state_path = get_language_state_path(username) if STATE_DIR else None
+        totals = aggregate_language_totals(repos, token, state_path=state_path, listing=listing)
+    except Exception as e:
+        print(f"Error fetching language stats: {e}")
+        return None
+    if not totals and listing is not None and not listing.get("complete"):
+        return None  # Nothing listed and nothing kept from an earlier run
+    return totals
+
+
+@run_metrics.stage("fetch")
+def fetch_user_dataset(username, token):
+    """Fetch everything the three cards need for one user.
+
+    Any part that cannot be fetched falls back to the user's last good
+    snapshot, then to sample data, so the returned dict is always
+    renderable. Keys: username, user_data, total_stars,
+    contribution_stats, languages, language_totals, language_colors and
+    sources (where each part came from). Live parts are saved back to the
+    snapshot.
+    """
+    dataset = {"username": username, "sources": {}}
+    fetched = None
+    if token and FETCH_MODE in ("auto", "graphql"):
+        try:
+            fetched = fetch_stats_graphql(username, token)
+        except Exception as e:
+            print(f"Error fetching GraphQL stats: {e}")
+        if fetched is None:
+            print("  GraphQL fetch failed, falling back to REST.")
+
+    if fetched:
+        resolve_user_data(dataset, fetched["user_data"])
+        resolve_total_stars(dataset, fetched["total_stars"], live=True)
+        contribution_stats = fetch_contribution_stats(
+            username, token, fetched["contribution_stats"], dataset["sources"]
+        )
+        resolve_languages(dataset, fetched["languages"], fetched["language_colors"])
+    else:
+        try:
+            user_data = fetch_user_data(username, token)
+            report_rest_estimate(user_data)
+        except Exception as e:
+            print(f"Error fetching live stats: {e}")
+            user_data = None
+        contribution_stats = fetch_contribution_stats(username, token, sources=dataset["sources"])
+        # Repo pages stream straight into the language lookups
+        tally = {"repos": 0, "stars": 0}
+        print(f"Fetching repositories for {username}...")
+        repos = stream_repos(username, token, (user_data or {}).get("public_repos"), tally)
+        totals = fetch_languages(username, repos, token, listing=tally)
+        print(f"  Found {tally['repos']} repositories")
+        listed = tally.get("complete") and (tally["repos"] > 0 or (user_data or {}).get("public_repos") == 0)
+        resolve_user_data(dataset, user_data)
+        resolve_total_stars(dataset, tally["stars"], live=listed)
+        resolve_languages(dataset, totals)
+
+    dataset["contribution_stats"] = contribution_stats
+    save_snapshot(dataset)
+    return dataset
+
+
+def generate_user_cards(username, token, output_dir):
+    """Fetch data for one user and write their three SVG cards.
+
+    Returns the number of cards generated from real (or sample) data.
+    """
+    return write_user_cards(fetch_user_dataset(username, token), output_dir)
+
+
+async def generate_user_cards_async(username, token, output_dir):
+    """Fetch and render one user's cards as a graph of asyncio tasks.
+
+    Independent fetches (profile, repo list, contributions) start at once
+    and each card is written as soon as its own inputs are ready, so total
+    latency approaches the longest chain rather than the sum of all calls.
+    Blocking calls run in worker threads over the shared connection pool,
+    keeping the retry, cache and rate-limit logic in one place. Fallbacks
+    and the snapshot work as in fetch_user_dataset().
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stats_path = os.path.join(output_dir, "stats.svg")
+    langs_path = os.path.join(output_dir, "top-langs.svg")
+    streak_path = os.path.join(output_dir, "streak.svg")
+
+    fetched = None
+    if token and FETCH_MODE in ("auto", "graphql"):
+        try:
+            fetched = await asyncio.to_thread(fetch_stats_graphql, username, token)
+        except Exception as e:
+            print(f"Error fetching GraphQL stats: {e}")
+        if fetched is None:
+            print("  GraphQL fetch failed, falling back to REST.")
+
+    dataset = {"username": username, "sources": {}}
+
+    async def fetch_user():
+        try:
+            user_data = await asyncio.to_thread(fetch_user_data, username, token)
+        except Exception as e:
+            print(f"Error fetching user data: {e}")
+            user_data = None
+        if user_data:
+            report_rest_estimate(user_data)
+        return resolve_user_data(dataset, user_data)
+
+    tally = {"repos": 0, "stars": 0}
+
+    async def fetch_repo_languages():
+        # Repo pages stream straight into the language lookups
+        print(f"Fetching repositories for {username}...")
+        repos = stream_repos(username, token, None, tally)
+        totals = await asyncio.to_thread(fetch_languages, username, repos, token, tally)
+        print(f"  Found {tally['repos']} repositories")
+        return resolve_languages(dataset, totals)
+
+    async def count_stars(user_task, languages_task):
+        # Stars are tallied as the repo listing streams past; the lean
+        # GraphQL query only stands in when that listing broke off
+        await languages_task
+        listed = tally.get("complete") and (tally["repos"] > 0 or (await user_task).get("public_repos") == 0)
+        if listed:
+            return resolve_total_stars(dataset, tally["stars"], live=True)
+        metrics = None
+        if token and FETCH_MODE in ("auto", "graphql"):
+            try:
+                metrics = await asyncio.to_thread(fetch_star_metrics, username, token)
+            except Exception as e:
+                print(f"Error counting stars: {e}")
+        if metrics:
+            return resolve_total_stars(dataset, metrics["stars"], live=True)
+        return resolve_total_stars(dataset, tally["stars"], live=False)
+
+    async def fetch_contributions(contribution_stats=None):
+        contribution_stats = await asyncio.to_thread(
+            fetch_contribution_stats, username, token, contribution_stats, dataset["sources"]
+        )
+        dataset["contribution_stats"] = contribution_stats
+        return contribution_stats
+
+    if fetched:
+        resolve_user_data(dataset, fetched["user_data"])
+        resolve_total_stars(dataset, fetched["total_stars"], live=True)
+        resolve_languages(dataset, fetched["languages"], fetched["language_colors"])
+        user_task = asyncio.create_task(asyncio.sleep(0, dataset["user_data"]))
+        stars_task = asyncio.create_task(asyncio.sleep(0, dataset["total_stars"]))
+        languages_task = asyncio.create_task(asyncio.sleep(0, dataset["languages"]))
+        contributions_task = asyncio.create_task(fetch_contributions(fetched["contribution_stats"]))
+    else:
+        user_task = asyncio.create_task(fetch_user())
+        languages_task = asyncio.create_task(fetch_repo_languages())
+        stars_task = asyncio.create_task(count_stars(user_task, languages_task))
+        contributions_task = asyncio.create_task(fetch_contributions())
+
+    async def stats_card():
+        user_data, total_stars, contribution_stats = await asyncio.gather(
+            user_task, stars_task, contributions_task
+        )
+        return await asyncio.to_thread(
+            generate_stats_svg, user_data, total_stars, contribution_stats, stats_path
+        )
+
+    async def langs_card():
+        return await asyncio.to_thread(generate_top_langs_svg, await languages_task, langs_path)
+
+    async def streak_card():
+        contribution_stats = await contributions_task
+        return await asyncio.to_thread(
+            generate_streak_svg,
+            contribution_stats.get("calendar"),
+            streak_path,
+            contribution_stats.get("history"),
+            contribution_stats.get("streaks"),
+        )
+
+    cards = [
+        (stats_card(), stats_path, "Stats unavailable"),
+        (langs_card(), langs_path, "Languages unavailable"),
+        (streak_card(), streak_path, "Contributions unavailable"),
+    ]
+    results = await asyncio.gather(*(card for card, _, _ in cards), return_exceptions=True)
+    if {"user_data", "total_stars", "languages", "contribution_stats"} <= dataset.keys():
+        save_snapshot(dataset)
+
+    success_count = 0
+    for result, (_, path, message) in zip(results, cards):
+        if isinstance(result, Exception):
+            print(f"Error generating {os.path.basename(path)}: {result}")
+            write_placeholder_svg(path, message)
+        elif result:
+            success_count += 1
+    return success_count
@@ -0,0 +1,904 @@
+"""Fetchers for the GitHub REST and GraphQL APIs."""
+
+import math
+import os
+import queue
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from .cards import summarize_languages
+from .client import (
+    ResponseCache,
+    get_json,
+    get_response_cache,
+    http_request,
+    make_graphql_request,
+    make_rest_page_request,
+    make_rest_request,
+)
+from .config import (
+    CALENDAR_REFRESH,
+    CALENDAR_REFRESH_DAYS,
+    CALENDAR_STATE_VERSION,
+    CONTRIBUTION_HISTORY_VERSION,
+    CONTRIBUTION_WORKERS,
+    GITHUB_API_BASE,
+    GRAPHQL_LANGUAGES_PER_REPO,
+    HTTP_POOL_SIZE,
+    LANGUAGE_STATE_VERSION,
+    LANGUAGE_WORKERS,
+    REPOS_PER_PAGE,
+    REPO_PAGE_WORKERS,
+    STATE_DIR,
+    STREAK_HISTORY,
+)
+from .contributions import ContributionCalendar, get_contrib_color
+from .metrics import run_metrics
+from .ratelimit import rate_budget
+from .storage import load_state, save_state
+
+
+@run_metrics.stage("fetch.rate_limit")
+def fetch_rate_limit(token):
+    """Seed the rate limit budget from GET /rate_limit (which is free)."""
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    if token:
+        headers["Authorization"] = f"token {token}"
+    try:
+        response = http_request("GET", f"{GITHUB_API_BASE}/rate_limit", headers=headers)
+        response.raise_for_status()
+        rate_budget.update_from_rate_limit(response.json())
+    except (requests.RequestException, ValueError) as e:
+        print(f"Warning: could not read rate limit: {e}")
+
+
+@run_metrics.stage("fetch.user")
+def fetch_user_data(username, token):
+    """Fetch basic user data from REST API."""
+    print(f"Fetching user data for {username}...")
+    return make_rest_request(f"/users/{username}", token)
+
+
+def get_last_page(links):
+    """Page number of the `last` Link relation, or None if absent."""
+    if "last" not in links:
+        return None
+    pages = parse_qs(urlsplit(links["last"]).query).get("page")
+    try:
+        return int(pages[0]) if pages else None
+    except ValueError:
+        return None
+
+
+def iter_repo_pages(username, token, public_repos=None, workers=None, status=None):
+    """Yield pages of a user's repositories as they arrive.
+
+    The page count comes from the first response's `Link: rel="last"`
+    header, or failing that from `public_repos`; the remaining pages are
+    then fetched concurrently and yielded in completion order. Without
+    either hint the pages are walked one at a time. `status["complete"]`
+    is set to whether every page was listed.
+    """
+    if status is None:
+        status = {}
+    status["complete"] = False
+    endpoint = f"/users/{username}/repos?per_page={REPOS_PER_PAGE}&type=owner&sort=updated"
+    repos, links = make_rest_page_request(f"{endpoint}&page=1", token)
+    if repos is None:
+        return
+    if repos:
+        yield repos
+    if len(repos) < REPOS_PER_PAGE and "next" not in links:
+        status["complete"] = True
+        return
+
+    last_page = get_last_page(links)
+    if last_page is None and public_repos:
+        last_page = math.ceil(public_repos / REPOS_PER_PAGE)
+
+    page = 2
+    if last_page and last_page >= 2:
+        if workers is None:
+            workers = REPO_PAGE_WORKERS
+        workers = max(1, min(workers, HTTP_POOL_SIZE, last_page - 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(make_rest_request, f"{endpoint}&page={number}", token): number
+                for number in range(2, last_page + 1)
+            }
+            last_full = False
+            failed = False
+            for future in as_completed(futures):
+                repos = future.result()
+                if futures[future] == last_page:
+                    last_full = bool(repos) and len(repos) >= REPOS_PER_PAGE
+                if repos is None:
+                    failed = True
+                elif repos:
+                    yield repos
+        if failed:
+            return
+        if not last_full:
+            status["complete"] = True
+            return
+        # The hint undercounted (repos created mid-run); keep walking
+        page = last_page + 1
+
+    while True:
+        repos = make_rest_request(f"{endpoint}&page={page}", token)
+        if repos is None:
+            return
+        if repos:
+            yield repos
+        if len(repos) < REPOS_PER_PAGE:
+            break
+        page += 1
+    status["complete"] = True
+
+
+def stream_repos(username, token, public_repos, tally):
+    """Yield a user's repos page by page, counting repos and stars in `tally`.
+
+    `tally["complete"]` is set to whether the listing finished.
+    """
+    for repos in iter_repo_pages(username, token, public_repos, status=tally):
+        tally["repos"] += len(repos)
+        tally["stars"] += calculate_total_stars(repos)
+        yield from repos
+
+
+@run_metrics.stage("fetch.repos")
+def fetch_repos(username, token, public_repos=None):
+    """Fetch all user repositories, paging concurrently where possible."""
+    print(f"Fetching repositories for {username}...")
+    all_repos = []
+    for repos in iter_repo_pages(username, token, public_repos):
+        all_repos.extend(repos)
+    
+    print(f"  Found {len(all_repos)} repositories")
+    return all_repos
+
+
+def fetch_languages_for_repo(languages_url, token):
+    """Fetch language breakdown for a single repo (None if the request fails)."""
+    try:
+        return get_json(languages_url, token)
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def read_cached_languages(repo, token):
+    """Best-effort language data for a deferred repo from the response cache."""
+    cache = get_response_cache()
+    if not cache or not repo.get("languages_url"):
+        return None
+    entry = cache.get(ResponseCache.make_key(repo["languages_url"], token))
+    if not entry:
+        return None
+    rate_budget.count("cache_fallback")
+    return entry["body"]
+
+
+def get_language_state_path(username):
+    """Path of the incremental language state file for a user."""
+    return os.path.join(STATE_DIR, f"languages-{username.lower()}.json")
+
+
+def get_repo_key(repo):
+    """Stable identifier for a repo in the language state file."""
+    return str(repo.get("id") or repo.get("full_name"))
+
+
+def apply_language_delta(totals, old_langs, new_langs):
+    """Update language totals in place for a repo changing from old to new."""
+    for lang in set(old_langs) | set(new_langs):
+        value = totals.get(lang, 0) + new_langs.get(lang, 0) - old_langs.get(lang, 0)
+        if value > 0:
+            totals[lang] = value
+        else:
+            totals.pop(lang, None)
+
+
+def update_language_state(repos, token, state, workers=None, track_repos=True, listing=None):
+    """Bring language state up to date with a stream of repos; returns (state, repos fetched)."""
+    # Only new repos and those whose pushed_at changed are fetched. Without
+    # track_repos only per-language totals are kept, so memory is bounded by
+    # languages rather than repos
+    if not state or state.get("version") != LANGUAGE_STATE_VERSION:
+        state = {"version": LANGUAGE_STATE_VERSION, "repos": {}, "totals": {}}
+
+    known = state["repos"]
+    totals = dict(state["totals"])
+    repo_states = {}
+    seen = set()
+    budget = rate_budget.available("core")
+    deferred = 0
+
+    def fold(repo_id, pushed_at, repo_langs):
+        old = known.get(repo_id)
+        if repo_langs is None:
+            # Keep the previous counts; the stale pushed_at forces a retry next run
+            if old:
+                repo_states[repo_id] = old
+            return
+        apply_language_delta(totals, old["languages"] if old else {}, repo_langs)
+        if track_repos:
+            repo_states[repo_id] = {"pushed_at": pushed_at, "languages": repo_langs}
+
+    if workers is None:
+        workers = LANGUAGE_WORKERS
+    workers = max(1, min(workers, HTTP_POOL_SIZE))
+    done = queue.SimpleQueue()
+    submitted = pending = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for repo in repos:
+            repo_id = get_repo_key(repo)
+            # Pages listed concurrently can overlap if a repo moves between them
+            if repo.get("fork") or repo_id in seen:
+                continue
+            seen.add(repo_id)
+
+            entry = known.get(repo_id)
+            pushed_at = repo.get("pushed_at")
+            # Lookups start as each repo arrives and fold in as they complete
+            if entry and entry["pushed_at"] == pushed_at:
+                repo_states[repo_id] = entry
+            elif not repo.get("languages_url"):
+                fold(repo_id, pushed_at, {})
+            elif budget is not None and submitted >= budget:
+                # Past the REST budget, repos keep their previous counts
+                deferred += 1
+                if not entry:
+                    # A cached copy stands in until a run with budget refetches it
+                    fold(repo_id, None, read_cached_languages(repo, token))
+                else:
+                    repo_states[repo_id] = entry
+            else:
+                future = executor.submit(fetch_languages_for_repo, repo["languages_url"], token)
+                future.add_done_callback(
+                    lambda f, repo_id=repo_id, pushed_at=pushed_at: done.put((repo_id, pushed_at, f))
+                )
+                submitted += 1
+                pending += 1
+
+            while not done.empty():
+                repo_id, pushed_at, future = done.get()
+                fold(repo_id, pushed_at, future.result())
+                pending -= 1
+
+        while pending:
+            repo_id, pushed_at, future = done.get()
+            fold(repo_id, pushed_at, future.result())
+            pending -= 1
+
+    complete = listing is None or listing.get("complete")
+    for repo_id, entry in known.items():
+        if repo_id in seen:
+            continue
+        if complete:
+            apply_language_delta(totals, entry["languages"], {})
+        else:
+            # The listing broke off, so an unseen repo may still exist
+            repo_states[repo_id] = entry
+
+    if deferred:
+        rate_budget.count("deferred", deferred)
+        rate_budget.note(
+            f"REST budget covered {budget} language lookups; "
+            f"deferring {deferred} more repositories"
+        )
+
+    state = {"version": LANGUAGE_STATE_VERSION, "repos": repo_states, "totals": totals}
+    return state, submitted
+
+
+def aggregate_language_totals(repos, token, workers=None, state_path=None, listing=None):
+    """Sum language bytes across all repos into a {language: bytes} dict.
+
+    `repos` may be a stream, such as the pages from iter_repo_pages(), so
+    lookups overlap with listing. With `state_path`, totals are maintained
+    incrementally in that file and only repos pushed since the previous run
+    are re-fetched. `listing` is the stream's status dict (see
+    iter_repo_pages()); the state is only saved if the listing completed.
+    """
+    print("Aggregating language data...")
+    state = load_state(state_path) if state_path else None
+    state, fetched = update_language_state(
+        repos, token, state, workers, track_repos=bool(state_path), listing=listing
+    )
+    if listing is not None and not listing.get("complete"):
+        print("  Repository listing incomplete; keeping the previous language state")
+    elif state_path:
+        try:
+            save_state(state_path, state)
+        except OSError as e:
+            print(f"  Warning: could not save language state: {e}")
+        print(f"  Re-fetched languages for {fetched} of {len(state['repos'])} repositories")
+    return state["totals"]
+
+
+def aggregate_languages(repos, token, workers=None, state_path=None):
+    """Aggregate language usage across all repos into the card's list."""
+    result = summarize_languages(aggregate_language_totals(repos, token, workers, state_path))
+    
+    print(f"  Found {len(result)} languages")
+    return result
+
+
+def calculate_total_stars(repos):
+    """Calculate total stars across all repos."""
+    return sum(repo.get("stargazers_count", 0) for repo in repos if not repo.get("fork"))
+
+
+STAR_METRICS_QUERY = """
+query($login: String!, $cursor: String) {
+    rateLimit { cost remaining resetAt limit }
+    user(login: $login) {
+        repositories(
+            first: 100
+            after: $cursor
+            privacy: PUBLIC
+            ownerAffiliations: OWNER
+            isFork: false
+        ) {
+            totalCount
+            pageInfo { hasNextPage endCursor }
+            nodes { stargazerCount }
+        }
+    }
+}
+"""
+
+
+@run_metrics.stage("fetch.stars")
+def fetch_star_metrics(username, token):
+    """Count a user's owned, non-fork repos and their stars via GraphQL.
+
+    Only `stargazerCount` is requested per repo, so each page of 100 is a
+    few KB instead of the ~600 KB of full REST repo objects, and the pages
+    are folded into running totals as they arrive. Returns
+    {"repos": ..., "stars": ...}, or None if any page fails.
+    """
+    print(f"Counting stars for {username} via GraphQL...")
+    repo_count = None
+    total_stars = 0
+    cursor = None
+
+    while True:
+        data = make_graphql_request(STAR_METRICS_QUERY, token, {"login": username, "cursor": cursor})
+        if not data or not (data.get("data") or {}).get("user"):
+            return None
+        rate_budget.update_from_graphql(data["data"].get("rateLimit"))
+
+        repositories = data["data"]["user"]["repositories"]
+        repo_count = repositories["totalCount"]
+        total_stars += sum(repo.get("stargazerCount", 0) for repo in repositories["nodes"])
+
+        page_info = repositories["pageInfo"]
+        if not page_info["hasNextPage"]:
+            break
+        cursor = page_info["endCursor"]
+
+    print(f"  {total_stars} stars across {repo_count} repositories")
+    return {"repos": repo_count, "stars": total_stars}
+
+
+CONTRIBUTIONS_FIELDS = """
+    totalCommitContributions
+    totalPullRequestContributions
+    totalIssueContributions
+    totalPullRequestReviewContributions
+    contributionCalendar @include(if: $withCalendar) {
+        totalContributions
+        weeks {
+            contributionDays {
+                date
+                contributionCount
+                color
+            }
+        }
+    }
+"""
+
+
+def parse_contributions_collection(collection):
+    """Convert a GraphQL contributionsCollection into contribution stats."""
+    return {
+        "calendar": collection.get("contributionCalendar"),
+        "commits": collection.get("totalCommitContributions", 0),
+        "pull_requests": collection.get("totalPullRequestContributions", 0),
+        "issues": collection.get("totalIssueContributions", 0),
+        "reviews": collection.get("totalPullRequestReviewContributions", 0),
+    }
+
+
+def fetch_contributions_data(username, token):
+    """Fetch contributions calendar and contribution counts using GraphQL."""
+    print(f"Fetching contribution stats for {username}...")
+
+    query = """
+    query($login: String!, $withCalendar: Boolean = true) {
+        user(login: $login) {
+            contributionsCollection {%s}
+        }
+    }
+    """ % CONTRIBUTIONS_FIELDS
+
+    data = make_graphql_request(query, token, {"login": username})
+    if data and "data" in data and data["data"]["user"]:
+        collection = data["data"]["user"]["contributionsCollection"]
+        return parse_contributions_collection(collection)
+    return None
+
+
+CONTRIBUTION_YEARS_QUERY = """
+query($login: String!) {
+    user(login: $login) {
+        contributionsCollection { contributionYears }
+    }
+}
+"""
+
+CONTRIBUTION_WINDOW_QUERY = """
+query($login: String!, $from: DateTime!, $to: DateTime!) {
+    user(login: $login) {
+        contributionsCollection(from: $from, to: $to) {
+            contributionCalendar {
+                weeks { contributionDays { date contributionCount } }
+            }
+        }
+    }
+}
+"""
+
+
+def fetch_contribution_years(username, token):
+    """Fetch the list of years the user has contributions in (newest first)."""
+    data = make_graphql_request(CONTRIBUTION_YEARS_QUERY, token, {"login": username})
+    if not data or not (data.get("data") or {}).get("user"):
+        return None
+    return data["data"]["user"]["contributionsCollection"]["contributionYears"]
+
+
+def fetch_contribution_year(username, token, year):
+    """Fetch one calendar year of daily counts as a ContributionCalendar."""
+    variables = {
+        "login": username,
+        "from": f"{year}-01-01T00:00:00Z",
+        "to": f"{year}-12-31T23:59:59Z",
+    }
+    data = make_graphql_request(CONTRIBUTION_WINDOW_QUERY, token, variables)
+    if not data or not (data.get("data") or {}).get("user"):
+        return None
+    collection = data["data"]["user"]["contributionsCollection"]
+    return ContributionCalendar.from_calendar_data(collection["contributionCalendar"])
+
+
+def get_contribution_history_path(username):
+    """Path of the cached per-year contribution history for a user."""
+    return os.path.join(STATE_DIR, f"contributions-{username.lower()}.json")
+
+
+def fetch_contribution_history(username, token, recent_calendar, workers=None):
+    """Build a full-history ContributionCalendar for a user.
+
+    Completed years never change, so they are fetched once (concurrently)
+    and cached in STATE_DIR; the current year comes from `recent_calendar`,
+    the one-year calendar already fetched for the card. After the first
+    run this costs no extra queries except on the first run of a new year.
+    """
+    today = datetime.utcnow().date()
+    path = get_contribution_history_path(username) if STATE_DIR else None
+    state = (load_state(path) if path else None) or {}
+    if state.get("version") != CONTRIBUTION_HISTORY_VERSION:
+        state = {}
+    windows = state.get("windows", {})
+
+    # The current year always comes from `recent_calendar`, so the list of
+    # past years only needs checking once a day
+    years = state.get("years")
+    years_date = state.get("years_date")
+    if years is None or years_date != today.isoformat():
+        fetched_years = fetch_contribution_years(username, token)
+        if fetched_years is not None:
+            years, years_date = fetched_years, today.isoformat()
+        years = years or []
+
+    missing = [year for year in years if year < today.year and str(year) not in windows]
+    if missing:
+        print(f"  Fetching contribution history for {len(missing)} past years...")
+        workers = max(1, min(workers or CONTRIBUTION_WORKERS, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            fetched = list(executor.map(lambda y: fetch_contribution_year(username, token, y), missing))
+        for year, calendar in zip(missing, fetched):
+            if calendar is not None:
+                windows[str(year)] = calendar.to_dict()
+
+    if path:
+        try:
+            save_state(path, {
+                "version": CONTRIBUTION_HISTORY_VERSION,
+                "years": years,
+                "years_date": years_date,
+                "windows": windows,
+            })
+        except OSError as e:
+            print(f"  Warning: could not save contribution history: {e}")
+
+    calendars = [ContributionCalendar.from_dict(windows[key]) for key in sorted(windows)]
+    calendars.append(recent_calendar)
+    return ContributionCalendar.merge(calendars)
+
+
+CONTRIBUTIONS_REFRESH_QUERY = """
+query($login: String!, $from: DateTime!, $to: DateTime!, $withTotals: Boolean!) {
+    user(login: $login) {
+        totals: contributionsCollection @include(if: $withTotals) {
+            totalCommitContributions
+            totalPullRequestContributions
+            totalIssueContributions
+            totalPullRequestReviewContributions
+        }
+        recent: contributionsCollection(from: $from, to: $to) {
+            contributionCalendar {
+                weeks { contributionDays { date contributionCount color } }
+            }
+        }
+    }
+}
+"""
+
+
+def get_calendar_state_path(username):
+    """Path of the stored contribution calendar for a user."""
+    return os.path.join(STATE_DIR, f"calendar-{username.lower()}.json")
+
+
+def splice_calendar_days(state, calendar_data):
+    """Write every day of a contributionCalendar into the stored calendar.
+
+    The stored calendar keeps counts and palette indices for each day from
+    `start` onwards; it grows in either direction as needed and newer data
+    replaces older data for the same day.
+    """
+    counts = state["counts"]
+    colors = state["colors"]
+    palette = state["palette"]
+
+    for week in (calendar_data or {}).get("weeks", []):
+        for day in week.get("contributionDays", []):
+            try:
+                ordinal = date.fromisoformat(day.get("date") or "").toordinal()
+            except ValueError:
+                continue
+
+            if not counts:
+                state["start"] = ordinal
+            start = state["start"]
+            if ordinal < start:
+                padding = start - ordinal
+                counts[:0] = [0] * padding
+                colors[:0] = [0] * padding
+                start = state["start"] = ordinal
+                state.pop("checkpoint", None)  # Running values no longer line up
+            elif ordinal - start >= len(counts):
+                padding = ordinal - start - len(counts) + 1
+                counts.extend([0] * padding)
+                colors.extend([0] * padding)
+
+            color = day.get("color") or ""
+            if color not in palette:
+                palette.append(color)
+            counts[ordinal - start] = day.get("contributionCount", 0)
+            colors[ordinal - start] = palette.index(color)
+
+
+def advance_streaks(state, until):
+    """Running streak values from the stored checkpoint up to `until`.
+
+    Only days after the checkpoint are scanned. Returns a new checkpoint
+    dict (ordinal, current, longest, active_days) without saving it.
+    """
+    start = state["start"]
+    checkpoint = state.get("checkpoint") or {
+        "ordinal": start - 1, "current": 0, "longest": 0, "active_days": 0,
+    }
+    checkpoint = dict(checkpoint)
+    counts = state["counts"]
+
+    for ordinal in range(checkpoint["ordinal"] + 1, min(until, start + len(counts) - 1) + 1):
+        if counts[ordinal - start]:
+            checkpoint["current"] += 1
+            checkpoint["active_days"] += 1
+            checkpoint["longest"] = max(checkpoint["longest"], checkpoint["current"])
+        else:
+            checkpoint["current"] = 0
+        checkpoint["ordinal"] = ordinal
+    return checkpoint
+
+
+def get_view_start(state, end, days=365):
+    """First day (ordinal) of the one-year calendar view ending on `end`."""
+    view = state.get("view") or {"days": days, "sundays": False}
+    if view["sundays"]:
+        # GitHub's calendar opens on the Sunday on or before a year back
+        return end - days - (end - days) % 7
+    # Otherwise span as many days as the last full calendar did
+    return end - view["days"]
+
+
+def trim_calendar(state, first):
+    """Drop stored days before `first` (an ordinal)."""
+    drop = first - state["start"]
+    if drop > 0:
+        del state["counts"][:drop]
+        del state["colors"][:drop]
+        state["start"] = first
+
+
+def build_calendar_view(state, end, days=365):
+    """Rebuild a one-year contributionCalendar dict from the stored calendar.
+
+    Days are grouped into Sunday-based weeks like GitHub's own calendar.
+    """
+    start = state["start"]
+    first = max(start, get_view_start(state, end, days))
+    weeks = []
+    week_key = None
+    total = 0
+    for ordinal in range(first, end + 1):
+        count = state["counts"][ordinal - start]
+        color = state["palette"][state["colors"][ordinal - start]] or get_contrib_color(count)
+        if ordinal // 7 != week_key:  # Ordinals divisible by 7 are Sundays
+            week_key = ordinal // 7
+            weeks.append({"contributionDays": []})
+        weeks[-1]["contributionDays"].append({
+            "date": date.fromordinal(ordinal).isoformat(),
+            "contributionCount": count,
+            "color": color,
+        })
+        total += count
+    return {"totalContributions": total, "weeks": weeks}
+
+
+def refresh_contributions(username, token, totals=None):
+    """Refresh contribution stats from the stored calendar and a short trailing window."""
+    today = datetime.utcnow().date().toordinal()
+    path = get_calendar_state_path(username)
+    state = load_state(path)
+    # A calendar stored in another STREAK_HISTORY mode spans the wrong days,
+    # and one whose checkpoint is too old would cost more than a full fetch
+    if (
+        not state
+        or state.get("version") != CALENDAR_STATE_VERSION
+        or state.get("history") != STREAK_HISTORY
+        or "checkpoint" not in state
+        or today - state["checkpoint"]["ordinal"] > 300
+    ):
+        print(f"Fetching contribution stats for {username} (full calendar)...")
+        stats = fetch_contributions_data(username, token)
+        if not stats or not stats.get("calendar"):
+            return stats
+        state = {
+            "version": CALENDAR_STATE_VERSION,
+            "history": STREAK_HISTORY,
+            "counts": [],
+            "colors": [],
+            "palette": [""],
+        }
+        # Remember the full calendar's span so later views cover the same days
+        dates = [
+            date.fromisoformat(day["date"]).toordinal()
+            for week in stats["calendar"].get("weeks", [])
+            for day in week.get("contributionDays", [])
+        ]
+        if dates:
+            state["view"] = {"days": max(dates) - min(dates), "sundays": min(dates) % 7 == 0}
+        if STREAK_HISTORY == "full":
+            recent = ContributionCalendar.from_calendar_data(stats["calendar"])
+            history = fetch_contribution_history(username, token, recent)
+            state["start"] = history.start
+            state["counts"] = history.counts.tolist()
+            state["colors"] = [0] * len(history)
+        splice_calendar_days(state, stats["calendar"])
+    else:
+        window_start = min(state["checkpoint"]["ordinal"] + 1, today - CALENDAR_REFRESH_DAYS + 1)
+        # Only the days after the checkpoint (at least the last
+        # CALENDAR_REFRESH_DAYS) are queried and scanned for streaks
+        print(f"Refreshing contributions for {username} since {date.fromordinal(window_start)}...")
+        variables = {
+            "login": username,
+            "from": f"{date.fromordinal(window_start).isoformat()}T00:00:00Z",
+            "to": f"{date.fromordinal(today).isoformat()}T23:59:59Z",
+            "withTotals": totals is None,
+        }
+        data = make_graphql_request(CONTRIBUTIONS_REFRESH_QUERY, token, variables)
+        if not data or not (data.get("data") or {}).get("user"):
+            return None
+        user = data["data"]["user"]
+        splice_calendar_days(state, user["recent"]["contributionCalendar"])
+        stats = parse_contributions_collection(user.get("totals") or {})
+    if totals:
+        stats.update({key: totals[key] for key in ("commits", "pull_requests", "issues", "reviews")})
+
+    end = state["start"] + len(state["counts"]) - 1
+    if STREAK_HISTORY == "full":
+        state["checkpoint"] = advance_streaks(state, end - CALENDAR_REFRESH_DAYS)
+        streaks = advance_streaks(state, end)
+    else:
+        # Streaks come from the one-year view, so only the refresh point and
+        # the days that view can still reach are kept
+        state["checkpoint"] = {"ordinal": end - CALENDAR_REFRESH_DAYS}
+        trim_calendar(state, get_view_start(state, end))
+    try:
+        save_state(path, state)
+    except OSError as e:
+        print(f"  Warning: could not save contribution calendar: {e}")
+
+    stats["calendar"] = build_calendar_view(state, end)
+    if STREAK_HISTORY == "full":
+        stats["history"] = ContributionCalendar(state["start"], array("H", state["counts"]))
+        stats["streaks"] = {
+            "current": streaks["current"],
+            "longest": streaks["longest"],
+            "active_days": streaks["active_days"],
+        }
+    return stats
+
+
+GRAPHQL_STATS_QUERY = """
+query(
+    $login: String!
+    $cursor: String
+    $languages: Int!
+    $firstPage: Boolean!
+    $withCalendar: Boolean = true
+) {
+    rateLimit { cost remaining resetAt limit }
+    user(login: $login) {
+        login
+        followers @include(if: $firstPage) { totalCount }
+        publicRepos: repositories(privacy: PUBLIC, ownerAffiliations: OWNER) @include(if: $firstPage) {
+            totalCount
+        }
+        contributionsCollection @include(if: $firstPage) {%s}
+        repositories(
+            first: 100
+            after: $cursor
+            privacy: PUBLIC
+            ownerAffiliations: OWNER
+            isFork: false
+        ) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+                name
+                stargazerCount
+                languages(first: $languages, orderBy: {field: SIZE, direction: DESC}) {
+                    pageInfo { hasNextPage endCursor }
+                    edges { size node { name color } }
+                }
+            }
+        }
+    }
+}
+""" % CONTRIBUTIONS_FIELDS
+
+REPO_LANGUAGES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String, $languages: Int!) {
+    rateLimit { cost remaining resetAt limit }
+    repository(owner: $owner, name: $name) {
+        languages(first: $languages, after: $cursor, orderBy: {field: SIZE, direction: DESC}) {
+            pageInfo { hasNextPage endCursor }
+            edges { size node { name color } }
+        }
+    }
+}
+"""
+
+
+def fetch_remaining_languages(owner, name, cursor, token):
+    """Language edges of a repo after `cursor`, or None if a page fails."""
+    edges = []
+    while cursor:
+        variables = {"owner": owner, "name": name, "cursor": cursor, "languages": 100}
+        data = make_graphql_request(REPO_LANGUAGES_QUERY, token, variables)
+        if not data or not (data.get("data") or {}).get("repository"):
+            return None
+        rate_budget.update_from_graphql(data["data"].get("rateLimit"))
+        connection = data["data"]["repository"]["languages"]
+        edges.extend(connection["edges"])
+        page_info = connection["pageInfo"]
+        cursor = page_info["endCursor"] if page_info["hasNextPage"] else None
+    return edges
+
+
+@run_metrics.stage("fetch.graphql")
+def fetch_stats_graphql(username, token):
+    """Fetch everything the cards need through paginated GraphQL queries.
+
+    The first page also carries the profile counts and the contributions
+    collection, so a user with N repos costs about ceil(N/100) requests
+    instead of N+3. Returns a dict with the same shapes the REST path
+    produces, or None if any page fails.
+    """
+    print(f"Fetching stats for {username} via GraphQL...")
+    user_data = None
+    contribution_stats = None
+    total_stars = 0
+    languages = {}
+    language_colors = {}
+    repo_count = 0
+    cursor = None
+
+    while True:
+        variables = {
+            "login": username,
+            "cursor": cursor,
+            "languages": GRAPHQL_LANGUAGES_PER_REPO,
+            "firstPage": cursor is None,
+            # The incremental refresh fetches its own trailing window
+            "withCalendar": CALENDAR_REFRESH != "incremental",
+        }
+        data = make_graphql_request(GRAPHQL_STATS_QUERY, token, variables)
+        if not data or not (data.get("data") or {}).get("user"):
+            return None
+        user = data["data"]["user"]
+        rate_limit = data["data"].get("rateLimit")
+        rate_budget.update_from_graphql(rate_limit)
+
+        if cursor is None:
+            user_data = {
+                "login": user.get("login", username),
+                "followers": user["followers"]["totalCount"],
+                "public_repos": user["publicRepos"]["totalCount"],
+            }
+            # Later pages cost about the same as the first; bail out early
+            # rather than run dry halfway through the repo list
+            pages_left = math.ceil(user_data["public_repos"] / 100) - 1
+            available = rate_budget.available("graphql")
+            if rate_limit and available is not None and pages_left * rate_limit.get("cost", 1) > available:
+                rate_budget.note(
+                    f"GraphQL budget too low for {pages_left} more pages; using REST instead"
+                )
+                return None
+            contribution_stats = parse_contributions_collection(
+                user["contributionsCollection"]
+            )
+
+        repositories = user["repositories"]
+        for repo in repositories["nodes"]:
+            repo_count += 1
+            total_stars += repo.get("stargazerCount", 0)
+            edges = repo["languages"]["edges"]
+            page_info = repo["languages"].get("pageInfo") or {}
+            if page_info.get("hasNextPage"):
+                more = fetch_remaining_languages(
+                    user_data["login"], repo["name"], page_info["endCursor"], token
+                )
+                if more is None:
+                    return None
+                edges = edges + more
+            for edge in edges:
+                name = edge["node"]["name"]
+                languages[name] = languages.get(name, 0) + edge["size"]
+                if edge["node"].get("color"):
+                    language_colors[name] = edge["node"]["color"]
+
+        page_info = repositories["pageInfo"]
+        if not page_info["hasNextPage"]:
+            break
+        cursor = page_info["endCursor"]
+
+    print(f"  Found {repo_count} repositories")
+    return {
+        "user_data": user_data,
+        "total_stars": total_stars,
+        "languages": languages,
+        "language_colors": language_colors,
+        "contribution_stats": contribution_stats,
+    }
@@ -0,0 +1,150 @@
+"""Stage timings and HTTP statistics for the run report."""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from .config import GITHUB_API_BASE, GITHUB_GRAPHQL_URL
+from .ratelimit import rate_budget
+
+
+class RunMetrics:
+    """Stage timings and HTTP statistics for one run.
+
+    Stages are timed with `stage(name)` and accumulate count, total and
+    longest duration, so a stage run once per user in batch mode shows up
+    as one entry. Every HTTP attempt is recorded per endpoint pattern with
+    its status, duration, response size and whether it was a retry; cache
+    outcomes are counted separately. Thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self.stages = {}
+        self.endpoints = {}
+        self.cache = {}
+        self.info = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                stats = self.stages.setdefault(name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+                stats["count"] += 1
+                stats["seconds"] += elapsed
+                stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+
+    def record_request(self, url, status, seconds, size, retry):
+        """Record one HTTP attempt (status None for a connection failure)."""
+        endpoint = get_endpoint_pattern(url)
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {
+                "requests": 0, "retries": 0, "seconds": 0.0, "max_seconds": 0.0,
+                "bytes": 0, "statuses": {},
+            })
+            stats["requests"] += 1
+            stats["retries"] += int(retry)
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["bytes"] += size
+            key = str(status or "error")
+            stats["statuses"][key] = stats["statuses"].get(key, 0) + 1
+
+    def count_cache(self, outcome):
+        """Count a response cache outcome: hit, changed, miss or fallback."""
+        with self._lock:
+            self.cache[outcome] = self.cache.get(outcome, 0) + 1
+
+    def report(self):
+        """The run report as a JSON-serializable dict."""
+        with self._lock:
+            endpoints = {name: dict(stats, statuses=dict(stats["statuses"]))
+                         for name, stats in self.endpoints.items()}
+            report = {
+                "started_at": datetime.utcfromtimestamp(self.started_at).isoformat() + "Z",
+                "duration_seconds": round(time.perf_counter() - self._started, 4),
+                "info": dict(self.info),
+                "stages": {name: dict(stats) for name, stats in self.stages.items()},
+                "http": {
+                    "requests": sum(stats["requests"] for stats in endpoints.values()),
+                    "retries": sum(stats["retries"] for stats in endpoints.values()),
+                    "bytes": sum(stats["bytes"] for stats in endpoints.values()),
+                    "endpoints": endpoints,
+                },
+                "cache": dict(self.cache),
+            }
+        report["rate_limit"] = {
+            "limits": rate_budget.limits(),
+            "adaptations": dict(rate_budget.counters),
+            "actions": list(rate_budget.actions),
+        }
+        for stats in list(report["stages"].values()) + list(report["http"]["endpoints"].values()):
+            stats["seconds"] = round(stats["seconds"], 4)
+            stats["max_seconds"] = round(stats["max_seconds"], 4)
+        return report
+
+    def prometheus_text(self, report=None):
+        """The report in Prometheus text exposition format (all gauges)."""
+        report = report or self.report()
+        metrics = []
+
+        def add(name, help_text, samples):
+            metrics.append(f"# HELP readme_stats_{name} {help_text}")
+            metrics.append(f"# TYPE readme_stats_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+                metrics.append(f"readme_stats_{name}{{{label_text}}} {value}" if label_text
+                               else f"readme_stats_{name} {value}")
+
+        endpoints = report["http"]["endpoints"]
+        add("run_timestamp_seconds", "Unix time the run started.", [({}, round(self.started_at))])
+        add("run_duration_seconds", "Wall time of the run.", [({}, report["duration_seconds"])])
+        for key, help_text in (("cards_generated", "Cards rendered from data."),
+                               ("cards_total", "Cards the run tried to generate.")):
+            if key in report["info"]:
+                add(key, help_text, [({}, report["info"][key])])
+        add("stage_seconds", "Total time spent in each stage.",
+            [({"stage": name}, stats["seconds"]) for name, stats in sorted(report["stages"].items())])
+        add("stage_runs", "Times each stage ran.",
+            [({"stage": name}, stats["count"]) for name, stats in sorted(report["stages"].items())])
+        add("http_requests", "HTTP attempts by endpoint and status.",
+            [({"endpoint": name, "status": status}, count)
+             for name, stats in sorted(endpoints.items())
+             for status, count in sorted(stats["statuses"].items())])
+        add("http_seconds", "Time spent in HTTP requests by endpoint.",
+            [({"endpoint": name}, stats["seconds"]) for name, stats in sorted(endpoints.items())])
+        add("http_bytes", "Response bytes received by endpoint.",
+            [({"endpoint": name}, stats["bytes"]) for name, stats in sorted(endpoints.items())])
+        add("http_retries", "Retried HTTP attempts by endpoint.",
+            [({"endpoint": name}, stats["retries"]) for name, stats in sorted(endpoints.items())])
+        add("cache_responses", "Response cache outcomes.",
+            [({"outcome": outcome}, count) for outcome, count in sorted(report["cache"].items())])
+        add("rate_limit_remaining", "Requests left in the rate limit window.",
+            [({"resource": resource}, info["remaining"])
+             for resource, info in sorted(report["rate_limit"]["limits"].items())])
+        return "\n".join(metrics) + "\n"
+
+
+run_metrics = RunMetrics()
+
+
+def get_endpoint_pattern(url):
+    """Collapse a GitHub API URL to a low-cardinality endpoint label."""
+    if url == GITHUB_GRAPHQL_URL:
+        return "graphql"
+    path = urlsplit(url).path
+    base_path = urlsplit(GITHUB_API_BASE).path
+    if base_path and path.startswith(base_path):
+        path = path[len(base_path):]
+    path = re.sub(r"^/(users|orgs)/[^/]+", r"/\1/{login}", path)
+    return re.sub(r"^/repos/[^/]+/[^/]+", "/repos/{repo}", path) or "/"
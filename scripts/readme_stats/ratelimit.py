@@ -0,0 +1,133 @@
+"""Rate limit tracking shared by every request in the process."""
+
+import threading
+import time
+from datetime import datetime
+
+from .config import RATE_LIMIT_MAX_THROTTLE, RATE_LIMIT_RESERVE, RATE_LIMIT_THROTTLE_FRACTION
+
+
+class RateLimitBudget:
+    """Track GitHub rate limits and record how the run adapted to them.
+
+    Limits are read from X-RateLimit-* response headers, GraphQL
+    `rateLimit` fields and the /rate_limit endpoint, per resource
+    ("core" for REST, "graphql"). Every adaptation (throttling, deferred
+    repos, cached fallbacks) is counted so it can be reported at the end.
+    """
+
+    def __init__(self, reserve=RATE_LIMIT_RESERVE):
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._limits = {}
+        self.counters = {"throttled": 0, "deferred": 0, "cache_fallback": 0}
+        self.actions = []
+
+    def update(self, resource, remaining, limit=None, reset=None):
+        """Record the latest known limit state for a resource."""
+        with self._lock:
+            info = self._limits.setdefault(resource, {})
+            info["remaining"] = remaining
+            if limit is not None:
+                info["limit"] = limit
+            if reset is not None:
+                info["reset"] = reset
+
+    def update_from_headers(self, headers):
+        """Update from X-RateLimit-* response headers, if present."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        try:
+            self.update(
+                headers.get("X-RateLimit-Resource", "core"),
+                int(remaining),
+                int(headers.get("X-RateLimit-Limit", 0)) or None,
+                int(headers.get("X-RateLimit-Reset", 0)) or None,
+            )
+        except ValueError:
+            pass
+
+    def update_from_graphql(self, rate_limit):
+        """Update from a GraphQL `rateLimit { cost remaining resetAt }` object."""
+        if not rate_limit:
+            return
+        reset = None
+        if rate_limit.get("resetAt"):
+            try:
+                reset = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                pass
+        self.update("graphql", rate_limit.get("remaining", 0), rate_limit.get("limit"), reset)
+
+    def update_from_rate_limit(self, payload):
+        """Update from the body of GET /rate_limit."""
+        for resource, info in (payload or {}).get("resources", {}).items():
+            self.update(resource, info.get("remaining", 0), info.get("limit"), info.get("reset"))
+
+    def available(self, resource="core"):
+        """Requests that can still be spent, or None if the limit is unknown."""
+        with self._lock:
+            info = self._limits.get(resource)
+            if not info or self._is_reset(info):
+                return None
+            return max(0, info["remaining"] - self.reserve)
+
+    @staticmethod
+    def _is_reset(info):
+        return info.get("reset") is not None and info["reset"] <= time.time()
+
+    def before_request(self, resource):
+        """Block, throttle or refuse a request based on the remaining budget."""
+        with self._lock:
+            info = dict(self._limits.get(resource) or {})
+        if not info or self._is_reset(info):
+            return
+
+        remaining = info["remaining"]
+        if remaining <= 0:
+            # Only reachable mid-request, so the client is already loaded
+            from .client import RateLimitExceeded
+            raise RateLimitExceeded(f"{resource} rate limit exhausted")
+
+        limit = info.get("limit")
+        if limit and info.get("reset") and remaining < limit * RATE_LIMIT_THROTTLE_FRACTION:
+            # Spread what is left over the time until the window resets
+            delay = min(RATE_LIMIT_MAX_THROTTLE, (info["reset"] - time.time()) / remaining)
+            if delay > 0:
+                self.count("throttled")
+                time.sleep(delay)
+
+    def count(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def note(self, action):
+        """Record and print an adaptation the run made."""
+        with self._lock:
+            self.actions.append(action)
+        print(f"  Rate limit: {action}")
+
+    def limits(self):
+        """Copy of the latest known limit state, keyed by resource."""
+        with self._lock:
+            return {resource: dict(info) for resource, info in self._limits.items()}
+
+    def summary(self):
+        """Lines describing remaining budgets and every adaptation made."""
+        lines = []
+        with self._lock:
+            for resource in sorted(self._limits):
+                info = self._limits[resource]
+                lines.append(f"{resource}: {info['remaining']}/{info.get('limit', '?')} remaining")
+            if self.counters["throttled"]:
+                lines.append(f"throttled {self.counters['throttled']} requests")
+            if self.counters["deferred"]:
+                lines.append(f"deferred {self.counters['deferred']} repositories to a later run")
+            if self.counters["cache_fallback"]:
+                lines.append(f"served {self.counters['cache_fallback']} responses from cache")
+            lines.extend(self.actions)
+        return lines
+
+
+rate_budget = RateLimitBudget()
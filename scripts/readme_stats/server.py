@@ -0,0 +1,171 @@
+"""HTTP service rendering cards on demand (--serve)."""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .cards import render_user_cards
+from .config import (
+    GITHUB_LOGIN_RE,
+    SERVER_CACHE_SIZE,
+    SERVER_CACHE_TTL,
+    SERVER_FALLBACK_TTL,
+    SERVER_STALE_TTL,
+    THEME,
+    THEMES,
+)
+from .dataset import fetch_user_dataset
+
+
+class CardCache:
+    """In-memory LRU cache of user data with TTL and stale-while-revalidate.
+
+    Fresh entries are returned directly. Entries past `ttl` but within
+    `stale_ttl` are returned immediately while a single background refresh
+    runs. Concurrent misses for the same key share one call to `loader`.
+    Values for which `is_fallback(value)` is true are kept only for
+    `fallback_ttl` seconds, without a stale window.
+    """
+
+    def __init__(self, loader, ttl=SERVER_CACHE_TTL, stale_ttl=SERVER_STALE_TTL,
+                 max_entries=SERVER_CACHE_SIZE, is_fallback=None, fallback_ttl=SERVER_FALLBACK_TTL):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.is_fallback = is_fallback
+        self.fallback_ttl = fallback_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._refresher = ThreadPoolExecutor(max_workers=4)
+
+    def get(self, key):
+        """Return the cached value for `key`, loading it if needed."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value, ttl, stale_ttl = entry
+                age = now - stored_at
+                if age < ttl + stale_ttl:
+                    self._entries.move_to_end(key)
+                    if age >= ttl and key not in self._inflight:
+                        self._inflight[key] = Future()
+                        self._refresher.submit(self._load, key)
+                    return value
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if owner:
+            self._load(key)
+        return future.result()
+
+    def _load(self, key):
+        """Run the loader for `key` and resolve the in-flight future."""
+        with self._lock:
+            future = self._inflight[key]
+        try:
+            value = self.loader(key)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            return
+
+        if self.is_fallback and self.is_fallback(value):
+            ttl, stale_ttl = self.fallback_ttl, 0
+        else:
+            ttl, stale_ttl = self.ttl, self.stale_ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value, ttl, stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(value)
+
+
+def is_fallback(entry):
+    """Whether a cached user entry holds any data that is not live."""
+    return any(source != "live" for source in entry["dataset"]["sources"].values())
+
+
+class CardRequestHandler(BaseHTTPRequestHandler):
+    """Serve /stats.svg, /top-langs.svg and /streak.svg?user=<login>[&theme=<name>]."""
+
+    server_version = "ReadmeStats/1.0"
+    cache = None
+    default_user = None
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        name = parts.path.lstrip("/")
+        if name not in ("stats.svg", "top-langs.svg", "streak.svg"):
+            self.send_error(404)
+            return
+
+        query = parse_qs(parts.query)
+        username = query.get("user", [self.default_user])[0]
+        if not username or not GITHUB_LOGIN_RE.match(username):
+            self.send_error(400, "Invalid user")
+            return
+
+        theme = query.get("theme", [THEME])[0]
+        if theme not in THEMES:
+            self.send_error(400, "Unknown theme")
+            return
+
+        try:
+            entry = self.cache.get(username.lower())
+            cards = self.get_cards(entry, theme)
+        except Exception as e:
+            print(f"Error rendering cards for {username}: {e}")
+            self.send_error(502, "Upstream fetch failed")
+            return
+
+        body = cards[name]
+        self.send_response(200)
+        self.send_header("Content-Type", "image/svg+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if is_fallback(entry):
+            # Snapshot or sample data must not be kept downstream as if live
+            self.send_header("Cache-Control", "no-cache")
+        else:
+            self.send_header("Cache-Control", f"public, max-age={self.cache.ttl}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_cards(self, entry, theme):
+        """Cards for a cached user entry in a theme, rendered once per entry."""
+        cards = entry["cards"].get(theme)
+        if cards is None:
+            cards = entry["cards"][theme] = render_user_cards(entry["dataset"], theme)
+        return cards
+
+
+def serve(host, port, token, default_user=None):
+    """Run the render service until interrupted."""
+    def load_user(username):
+        # One upstream fetch per user; each theme renders from the same data
+        return {"dataset": fetch_user_dataset(username, token), "cards": {}}
+
+    handler = type("Handler", (CardRequestHandler,), {
+        "cache": CardCache(load_user, is_fallback=is_fallback),
+        "default_user": default_user,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Serving cards on http://{host}:{server.server_port}/stats.svg?user=<login>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
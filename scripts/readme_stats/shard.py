@@ -0,0 +1,117 @@
+"""Sharded batch runs: assigning users to shards and merging the results."""
+
+import hashlib
+import os
+
+from .config import SHARD_STATUS_DIR
+from .storage import load_state, save_state, write_if_changed
+
+
+def get_shard(username, count):
+    """Shard of a username among `count`, the same on every machine and run."""
+    digest = hashlib.sha256(username.lower().encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def load_manifest(path):
+    """Read a manifest pinning users to shards: a JSON object {username: shard}."""
+    manifest = load_state(path)
+    if not isinstance(manifest, dict):
+        raise ValueError(f"{path} is not a JSON object mapping usernames to shards")
+    return {name.lower(): int(shard) for name, shard in manifest.items()}
+
+
+def assign_shard(username, count, manifest=None):
+    """Shard a user belongs to: their manifest entry (modulo `count`) or the hash."""
+    shard = (manifest or {}).get(username.lower())
+    return get_shard(username, count) if shard is None else shard % count
+
+
+def select_shard(usernames, index, count, manifest=None):
+    """The usernames that belong to shard `index` of `count`."""
+    return [name for name in usernames if assign_shard(name, count, manifest) == index]
+
+
+def get_status_path(output_root, index, count):
+    """Path of a shard's status file under its output directory."""
+    return os.path.join(output_root, SHARD_STATUS_DIR, f"shard-{index}-of-{count}.json")
+
+
+def is_complete(entry):
+    """Whether a user's status entry has all three cards built from live data."""
+    sources = entry.get("sources") or {}
+    return entry.get("cards") == 3 and bool(sources) and all(
+        source == "live" for source in sources.values()
+    )
+
+
+def copy_cards(source_dir, target_dir):
+    """Copy a user's card files from a worker's output into the merged tree."""
+    if os.path.abspath(source_dir) == os.path.abspath(target_dir):
+        return
+    try:
+        names = [name for name in os.listdir(source_dir) if name.endswith((".svg", ".svgz"))]
+    except OSError:
+        return
+    os.makedirs(target_dir, exist_ok=True)
+    for name in names:
+        with open(os.path.join(source_dir, name), "rb") as f:
+            write_if_changed(os.path.join(target_dir, name), f.read())
+
+
+def merge_shards(output_root, count, shard_roots=None, usernames=None, manifest=None):
+    """Gather the outputs and status files of a sharded batch into `output_root`.
+
+    `shard_roots` are the output directories the workers wrote to (for
+    workers on other machines, wherever their artifacts were unpacked);
+    by default they are assumed to have shared `output_root`. Cards are
+    copied to output_root/<username>/. With the full `usernames` list,
+    users whose shard never reported are listed as not run, with the
+    shard they belong to.
+
+    Returns a summary that is also saved as merged.json next to the
+    status files: each shard's state, users complete, failed or not run,
+    users that needed retries, and the retry list, which is also written
+    to retry-users.txt for a follow-up run with --users-file.
+    """
+    statuses = {}
+    for root in shard_roots or [output_root]:
+        for index in range(count):
+            status = load_state(get_status_path(root, index, count))
+            if status and (index not in statuses or statuses[index][1].get("state") != "done"):
+                statuses[index] = (root, status)
+
+    shards = {}
+    users = {}
+    for index in range(count):
+        if index not in statuses:
+            shards[str(index)] = "missing"
+            continue
+        root, status = statuses[index]
+        shards[str(index)] = status.get("state", "unknown")
+        for name, entry in (status.get("users") or {}).items():
+            users[name] = dict(entry, shard=index)
+            copy_cards(os.path.join(root, name), os.path.join(output_root, name))
+
+    failed = [name for name, entry in users.items() if not is_complete(entry)]
+    not_run = {
+        name: assign_shard(name, count, manifest) for name in usernames or [] if name not in users
+    }
+    retried = {
+        name: entry.get("attempts", 1) for name, entry in users.items() if entry.get("attempts", 1) > 1
+    }
+    summary = {
+        "shards": shards,
+        "users": len(users) + len(not_run),
+        "complete": len(users) - len(failed),
+        "failed": failed,
+        "not_run": not_run,
+        "retried": retried,
+        "retry": failed + list(not_run),
+    }
+
+    status_dir = os.path.join(output_root, SHARD_STATUS_DIR)
+    save_state(os.path.join(status_dir, "merged.json"), summary)
+    with open(os.path.join(status_dir, "retry-users.txt"), "w", encoding="utf-8") as f:
+        f.writelines(f"{name}\n" for name in summary["retry"])
+    return summary
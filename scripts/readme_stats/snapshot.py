@@ -0,0 +1,246 @@
+"""Per-user dataset snapshots and the sample-data fallbacks."""
+
+import gzip
+import json
+import os
+from array import array
+from datetime import datetime
+
+from .cards import summarize_languages, write_user_cards
+from .config import SAMPLE_LANGUAGES, SNAPSHOT_DIR, SNAPSHOT_VERSION
+from .contributions import (
+    ContributionCalendar,
+    build_sample_contributions,
+    pack_calendar,
+    unpack_calendar,
+)
+from .storage import write_if_changed
+
+
+def get_sample_user_data(username):
+    """Return minimal user info to keep SVG generation meaningful."""
+    return {
+        "login": username,
+        "followers": 5,
+        "public_repos": 10,
+    }
+
+
+def get_snapshot_path(username):
+    """Path of a user's dataset snapshot."""
+    return os.path.join(SNAPSHOT_DIR, f"{username.lower()}.json.gz")
+
+
+def load_snapshot(username):
+    """Load a user's snapshot, or None if missing, unreadable or outdated."""
+    if not SNAPSHOT_DIR:
+        return None
+    try:
+        with gzip.open(get_snapshot_path(username), "rt", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, EOFError, ValueError):
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def load_snapshot_part(username, part):
+    """The last good copy of one dataset part, or None."""
+    return ((load_snapshot(username) or {}).get("parts") or {}).get(part)
+
+
+def save_snapshot(dataset):
+    """Merge a dataset's live parts into the user's snapshot.
+
+    Parts that came from a fallback keep their previous copy, so each part
+    of the snapshot is always the last one fetched successfully.
+    """
+    if not SNAPSHOT_DIR:
+        return
+    parts = encode_snapshot_parts(dataset)
+    if not parts:
+        return
+
+    username = dataset["username"]
+    snapshot = load_snapshot(username) or {
+        "version": SNAPSHOT_VERSION,
+        "username": username,
+        "parts": {},
+    }
+    snapshot["parts"].update(parts)
+    path = get_snapshot_path(username)
+    data = gzip.compress(
+        json.dumps(snapshot, separators=(",", ":"), sort_keys=True).encode("utf-8"), mtime=0
+    )
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        write_if_changed(path, data)
+    except OSError as e:
+        print(f"  Warning: could not save snapshot: {e}")
+
+
+def encode_snapshot_parts(dataset):
+    """The live parts of a dataset in snapshot form."""
+    sources = dataset.get("sources") or {}
+    saved_at = datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
+    parts = {}
+    if sources.get("user") == "live":
+        user_data = dataset["user_data"]
+        parts["user"] = {
+            "user_data": {
+                key: user_data[key] for key in ("login", "followers", "public_repos") if key in user_data
+            },
+        }
+    if sources.get("repos") == "live":
+        parts["repos"] = {"total_stars": dataset["total_stars"]}
+    if sources.get("languages") == "live":
+        parts["languages"] = {
+            "totals": dataset["language_totals"],
+            "colors": dataset.get("language_colors") or {},
+        }
+    if sources.get("contributions") == "live":
+        parts["contributions"] = encode_contributions(dataset["contribution_stats"])
+    for part in parts.values():
+        part["saved_at"] = saved_at
+    return parts
+
+
+def encode_contributions(contribution_stats):
+    """Contribution stats in snapshot form, with streaks precomputed."""
+    calendar_data = contribution_stats.get("calendar")
+    streaks = contribution_stats.get("streaks")
+    if not streaks and calendar_data and calendar_data.get("weeks"):
+        history = contribution_stats.get("history")
+        streaks = (history or ContributionCalendar.from_calendar_data(calendar_data)).streaks()
+
+    packed = pack_calendar(calendar_data)
+    if isinstance(packed, tuple):
+        first, total, counts, colors, palette, week_lengths = packed
+        counts_array = array("H")
+        counts_array.frombytes(counts)
+        calendar = {
+            "first": first,
+            "total": total,
+            "counts": counts_array.tolist(),
+            "colors": list(colors),
+            "palette": list(palette),
+            "weeks": list(week_lengths),
+        }
+    else:
+        calendar = {"raw": packed}
+
+    return {
+        "stats": {
+            key: contribution_stats.get(key, 0)
+            for key in ("commits", "pull_requests", "issues", "reviews")
+        },
+        "calendar": calendar,
+        "streaks": streaks,
+    }
+
+
+def decode_contributions(part):
+    """Rebuild contribution stats from encode_contributions() output."""
+    calendar = part.get("calendar") or {}
+    if "raw" in calendar:
+        calendar_data = calendar["raw"]
+    else:
+        calendar_data = unpack_calendar((
+            calendar["first"],
+            calendar["total"],
+            array("H", calendar["counts"]).tobytes(),
+            bytes(calendar["colors"]),
+            tuple(calendar["palette"]),
+            bytes(calendar["weeks"]),
+        ))
+    return dict(part["stats"], calendar=calendar_data, streaks=part.get("streaks"))
+
+
+def dataset_from_snapshot(username):
+    """A renderable dataset built only from a user's snapshot, or None.
+
+    Missing parts fall back to sample data; languages are re-summarized
+    with the current TOP_LANGUAGES/LANGUAGE_* settings.
+    """
+    snapshot = load_snapshot(username)
+    if not snapshot:
+        return None
+
+    parts = snapshot.get("parts") or {}
+    dataset = {"username": username, "sources": {}}
+    resolve_user_data(dataset, (parts.get("user") or {}).get("user_data"))
+    dataset["total_stars"] = (parts.get("repos") or {}).get("total_stars", 0)
+    languages = parts.get("languages") or {}
+    resolve_languages(dataset, languages.get("totals"), languages.get("colors"))
+    if "contributions" in parts:
+        dataset["contribution_stats"] = decode_contributions(parts["contributions"])
+    else:
+        print("  Using sample contribution data.")
+        dataset["contribution_stats"] = build_sample_contributions(username)
+    dataset["sources"] = {part: "snapshot" for part in parts}
+    return dataset
+
+
+def generate_from_snapshot(username, output_dir):
+    """Re-render a user's cards from their snapshot without any network access."""
+    dataset = dataset_from_snapshot(username)
+    if dataset is None:
+        print(f"  No usable snapshot for {username} in {SNAPSHOT_DIR or '(snapshots disabled)'}")
+        return 0
+    return write_user_cards(dataset, output_dir)
+
+
+def resolve_user_data(dataset, user_data):
+    """Set the dataset's profile: live, else last good snapshot, else sample."""
+    source = "live"
+    if not user_data:
+        part = load_snapshot_part(dataset["username"], "user")
+        if part:
+            print("  Using user stats from the last good snapshot.")
+            user_data, source = part["user_data"], "snapshot"
+        else:
+            print("  Falling back to sample user stats.")
+            user_data, source = get_sample_user_data(dataset["username"]), "sample"
+    dataset["user_data"] = user_data
+    dataset["sources"]["user"] = source
+    return user_data
+
+
+def resolve_total_stars(dataset, total_stars, live):
+    """Set the dataset's star count, using the snapshot's if the list failed."""
+    source = "live" if live else "sample"
+    if not live:
+        part = load_snapshot_part(dataset["username"], "repos")
+        if part:
+            print("  Using repository summary from the last good snapshot.")
+            total_stars, source = part["total_stars"], "snapshot"
+    dataset["total_stars"] = total_stars
+    dataset["sources"]["repos"] = source
+    return total_stars
+
+
+def resolve_languages(dataset, totals, colors=None):
+    """Set the dataset's languages from live totals, a snapshot or samples.
+
+    `totals` is None when the fetch failed; {} is a live result for a user
+    without language data.
+    """
+    source = "live" if totals is not None else "sample"
+    if totals is None:
+        part = load_snapshot_part(dataset["username"], "languages")
+        if part:
+            print("  Using languages from the last good snapshot.")
+            totals, colors, source = part["totals"], part["colors"], "snapshot"
+
+    languages = summarize_languages(totals or {}, colors=colors)
+    if languages:
+        print(f"  Found {len(languages)} languages")
+    else:
+        print("  Using sample languages mix.")
+        languages = SAMPLE_LANGUAGES
+    dataset["language_totals"] = totals or {}
+    dataset["language_colors"] = colors or {}
+    dataset["languages"] = languages
+    dataset["sources"]["languages"] = source
+    return languages
@@ -0,0 +1,72 @@
+"""Atomic writes for state files and cards."""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+
+from .config import WRITE_SVGZ
+
+
+def load_state(path):
+    """Load a JSON state file, returning None if missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_state(path, state):
+    """Atomically write a JSON state file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def write_if_changed(path, data):
+    """Atomically write bytes (a card, snapshot, copy...) to `path` unless it already holds them.
+
+    The new content is compared by hash with what is already on disk; if
+    it matches, the file is left untouched. Otherwise it is written to a
+    temporary file in the same directory and renamed into place. Returns
+    True if the file was written.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).hexdigest() == digest:
+                return False
+    except OSError:
+        pass
+
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+def write_card_files(path, data):
+    """Write a card (and its .svgz copy if enabled); True if the SVG changed."""
+    if WRITE_SVGZ:
+        # mtime=0 keeps the bytes stable so unchanged cards are skipped
+        write_if_changed(f"{path}z", gzip.compress(data, mtime=0))
+    return write_if_changed(path, data)
+
+
+def write_card(path, data, label="Generated"):
+    """Write a rendered card and report whether it changed."""
+    if write_card_files(path, data):
+        print(f"  {label} {path}")
+    else:
+        print(f"  Unchanged {path}")
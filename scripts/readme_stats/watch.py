@@ -0,0 +1,229 @@
+"""Watch mode: regenerate cards as a user's events show changes."""
+
+import time
+
+import requests
+
+from .cards import write_user_cards
+from .client import http_request
+from .config import (
+    FETCH_MODE,
+    GITHUB_API_BASE,
+    WATCH_INTERVAL,
+    WATCH_MAX_INTERVAL,
+    WATCH_STARS_INTERVAL,
+)
+from .dataset import fetch_contribution_stats, fetch_languages, fetch_user_dataset
+from .github import fetch_star_metrics, fetch_stats_graphql, stream_repos
+from .metrics import run_metrics
+from .snapshot import resolve_languages, resolve_total_stars, resolve_user_data, save_snapshot
+
+
+class ConditionalPoller:
+    """Re-GET one API URL with If-None-Match, returning only new bodies.
+
+    GitHub answers an unchanged resource with a 304 that does not count
+    against the rate limit, so a poll costs nothing while nothing
+    happens. `poll_interval` tracks the X-Poll-Interval header.
+    """
+
+    def __init__(self, url, token=None):
+        self.url = url
+        self.token = token
+        self.etag = None
+        self.poll_interval = 0
+
+    def poll(self):
+        """Return the decoded body, or None if unchanged since the last poll.
+
+        Raises requests.RequestException on failure.
+        """
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if self.token:
+            headers["Authorization"] = f"token {self.token}"
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+
+        response = http_request("GET", self.url, headers=headers)
+        try:
+            self.poll_interval = int(response.headers.get("X-Poll-Interval", self.poll_interval))
+        except ValueError:
+            pass
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        self.etag = response.headers.get("ETag")
+        return response.json()
+
+
+# Dataset parts an event can change: pushes add commits and may shift the
+# language mix, other contributions only move the calendar and totals
+EVENT_PARTS = {
+    "PushEvent": {"languages", "contributions"},
+    "PublicEvent": {"languages", "stars"},
+    "CreateEvent": {"contributions"},
+    "IssuesEvent": {"contributions"},
+    "PullRequestEvent": {"contributions"},
+    "PullRequestReviewEvent": {"contributions"},
+}
+
+# Dataset parts each card is rendered from
+CARD_PARTS = {
+    "stats.svg": {"user", "stars", "contributions"},
+    "top-langs.svg": {"languages"},
+    "streak.svg": {"contributions"},
+}
+
+
+def get_event_parts(events, last_id):
+    """Dataset parts touched by events newer than `last_id`, and the newest id."""
+    parts = set()
+    newest = last_id
+    for event in events:
+        try:
+            event_id = int(event["id"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if last_id is not None and event_id <= last_id:
+            continue
+        newest = max(newest or 0, event_id)
+        parts |= EVENT_PARTS.get(event.get("type"), set())
+        if event.get("type") == "CreateEvent" and (event.get("payload") or {}).get("ref_type") == "repository":
+            parts |= {"languages", "stars"}
+    return parts, newest
+
+
+def get_profile_parts(old, new):
+    """Dataset parts affected by a change between two REST user profiles."""
+    parts = set()
+    if old.get("followers") != new.get("followers"):
+        parts.add("user")
+    if old.get("public_repos") != new.get("public_repos"):
+        parts |= {"user", "languages", "stars"}
+    return parts
+
+
+def refresh_dataset(dataset, parts, token):
+    """Refetch the given parts of a dataset in place.
+
+    Parts that cannot be fetched keep their current value rather than
+    falling back to a snapshot or samples, so a failed poll never makes a
+    card worse.
+    """
+    username = dataset["username"]
+    fetched = None
+    if "languages" in parts:
+        if token and FETCH_MODE in ("auto", "graphql"):
+            try:
+                fetched = fetch_stats_graphql(username, token)
+            except Exception as e:
+                print(f"Error fetching GraphQL stats: {e}")
+        if fetched:
+            resolve_languages(dataset, fetched["languages"], fetched["language_colors"])
+            resolve_total_stars(dataset, fetched["total_stars"], live=True)
+            parts = parts - {"stars"}
+        else:
+            tally = {"repos": 0, "stars": 0}
+            repos = stream_repos(username, token, dataset["user_data"].get("public_repos"), tally)
+            totals = fetch_languages(username, repos, token, listing=tally)
+            if totals is not None:
+                resolve_languages(dataset, totals, dataset.get("language_colors") or None)
+            if tally["repos"] and tally.get("complete"):
+                # The listing already carried every star count
+                resolve_total_stars(dataset, tally["stars"], live=True)
+                parts = parts - {"stars"}
+
+    if "stars" in parts and token:
+        try:
+            metrics = fetch_star_metrics(username, token)
+        except Exception as e:
+            print(f"Error counting stars: {e}")
+            metrics = None
+        if metrics:
+            resolve_total_stars(dataset, metrics["stars"], live=True)
+
+    if "contributions" in parts:
+        sources = {}
+        # The GraphQL stats query above already carries the contributions
+        known = fetched["contribution_stats"] if fetched else None
+        contribution_stats = fetch_contribution_stats(username, token, known, sources)
+        if sources.get("contributions") == "live":
+            dataset["contribution_stats"] = contribution_stats
+            dataset["sources"]["contributions"] = "live"
+
+
+def watch(username, token, output_dir, on_update=None, max_polls=None):
+    """Keep one user's cards current, regenerating them as activity arrives.
+
+    After a full run, /users/{user}/events and the profile are polled with
+    conditional requests. New events and profile changes are mapped to the
+    dataset parts they can affect (EVENT_PARTS); only those parts are
+    refetched and only the cards built from them (CARD_PARTS) rewritten.
+    The interval drops back to WATCH_INTERVAL after any activity and
+    doubles while there is none. `on_update` is called after every write.
+    Runs until interrupted (or for `max_polls` polls) and returns the
+    number of cards the initial run generated.
+    """
+    dataset = fetch_user_dataset(username, token)
+    success_count = write_user_cards(dataset, output_dir)
+    if on_update:
+        on_update()
+
+    events = ConditionalPoller(f"{GITHUB_API_BASE}/users/{username}/events?per_page=100", token)
+    profile = ConditionalPoller(f"{GITHUB_API_BASE}/users/{username}", token)
+    last_event_id = None
+    try:
+        # The full run above already covers everything up to now
+        _, last_event_id = get_event_parts(events.poll() or [], None)
+        profile.poll()
+    except requests.RequestException as e:
+        print(f"Warning: could not read the event baseline: {e}")
+    stars_checked = time.monotonic()
+    interval = WATCH_INTERVAL
+    polls = 0
+
+    print(f"\nWatching {username} for changes (Ctrl+C to stop)")
+    try:
+        while max_polls is None or polls < max_polls:
+            time.sleep(max(interval, events.poll_interval))
+            polls += 1
+            parts = set()
+            try:
+                body = events.poll()
+                if body is not None:
+                    parts, newest = get_event_parts(body, last_event_id)
+                    if last_event_id is None:
+                        # No baseline yet: this poll becomes it
+                        parts = set()
+                    last_event_id = newest
+                user_data = profile.poll()
+                if user_data:
+                    parts |= get_profile_parts(dataset["user_data"], user_data)
+                    resolve_user_data(dataset, user_data)
+            except requests.RequestException as e:
+                print(f"Warning: poll failed: {e}")
+            if time.monotonic() - stars_checked >= WATCH_STARS_INTERVAL:
+                parts.add("stars")
+                stars_checked = time.monotonic()
+
+            if parts - {"stars"}:
+                interval = WATCH_INTERVAL
+            else:
+                interval = min(interval * 2, max(WATCH_MAX_INTERVAL, WATCH_INTERVAL))
+            if not parts:
+                continue
+
+            names = [name for name, inputs in CARD_PARTS.items() if inputs & parts]
+            print(f"\n[{time.strftime('%H:%M:%S')}] {', '.join(sorted(parts))} changed; updating {', '.join(names)}")
+            try:
+                with run_metrics.stage("watch.refresh"):
+                    refresh_dataset(dataset, parts, token)
+                save_snapshot(dataset)
+                write_user_cards(dataset, output_dir, names)
+            except Exception as e:
+                print(f"Error updating cards: {e}")
+            if on_update:
+                on_update()
+    except KeyboardInterrupt:
+        pass
+    return success_count
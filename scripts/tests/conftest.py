@@ -0,0 +1,39 @@
+import os
+import socket
+import sys
+import tempfile
+
+import pytest
+
+# Settings are read at import, so point readme_stats at a local API
+# stand-in and away from the real cache and state directories first
+with socket.socket() as sock:
+    sock.bind(("127.0.0.1", 0))
+    STAND_IN_PORT = sock.getsockname()[1]
+os.environ["GITHUB_API_URL"] = f"http://127.0.0.1:{STAND_IN_PORT}"
+os.environ["GITHUB_GRAPHQL_URL"] = f"http://127.0.0.1:{STAND_IN_PORT}/graphql"
+os.environ["HTTP_CACHE_DIR"] = ""
+os.environ["HTTP_MAX_RETRIES"] = "0"
+os.environ["STATE_DIR"] = tempfile.mkdtemp(prefix="readme-stats-test-state-")
+os.environ["SNAPSHOT_DIR"] = ""
+os.environ["RUN_REPORT"] = ""
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from readme_stats.bench import StandInServer, SyntheticGitHub  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def _stand_in():
+    server = StandInServer(SyntheticGitHub(0), address=("127.0.0.1", STAND_IN_PORT)).start()
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def github_api(_stand_in):
+    """The GitHub API stand-in, reset to 20 synthetic repos per user."""
+    _stand_in.data = SyntheticGitHub(20)
+    _stand_in.failures = {}
+    _stand_in.counters = {"requests": 0, "graphql": 0, "not_modified": 0}
+    return _stand_in
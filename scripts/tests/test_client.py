@@ -0,0 +1,28 @@
+import pytest
+
+from readme_stats import client
+from readme_stats.config import GITHUB_API_BASE
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = client.ResponseCache(str(tmp_path / "http"))
+    monkeypatch.setattr(client, "_response_cache", cache)
+    return cache
+
+
+def test_cache_survives_token_rotation(github_api, cache):
+    url = f"{GITHUB_API_BASE}/users/alice"
+    first = client.get_json(url, "token-from-job-1")
+    assert github_api.counters["not_modified"] == 0
+
+    # A later job brings a fresh token; the stored ETag must still be sent
+    second = client.get_json(url, "token-from-job-2")
+    assert github_api.counters["not_modified"] == 1
+    assert second == first
+
+
+def test_cache_keeps_anonymous_and_authenticated_apart():
+    url = "https://api.github.com/users/alice"
+    assert client.ResponseCache.make_key(url, "a") == client.ResponseCache.make_key(url, "b")
+    assert client.ResponseCache.make_key(url, "a") != client.ResponseCache.make_key(url, None)
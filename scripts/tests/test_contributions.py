@@ -0,0 +1,98 @@
+import random
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from readme_stats.contributions import (
+    ContributionCalendar,
+    build_sample_contributions,
+    calculate_streaks,
+    pack_calendar,
+    unpack_calendar,
+)
+
+
+def legacy_calculate_streaks(calendar_data):
+    """calculate_streaks() as it was before ContributionCalendar."""
+    if not calendar_data:
+        return {"current": 0, "longest": 0, "active_days": 0}
+
+    days = []
+    for week in calendar_data.get("weeks", []):
+        for day in week.get("contributionDays", []):
+            date_str = day.get("date")
+            count = day.get("contributionCount", 0)
+            if date_str:
+                try:
+                    days.append((datetime.strptime(date_str, "%Y-%m-%d"), count > 0))
+                except ValueError:
+                    continue
+
+    if not days:
+        return {"current": 0, "longest": 0, "active_days": 0}
+
+    days.sort(key=lambda x: x[0])
+    longest = current = active_days = 0
+    prev_date = None
+    prev_active = False
+    for day, is_active in days:
+        if is_active:
+            active_days += 1
+            if prev_date and (day - prev_date).days == 1 and prev_active:
+                current += 1
+            else:
+                current = 1
+            longest = max(longest, current)
+        else:
+            current = 0
+        prev_date = day
+        prev_active = is_active
+    return {"current": current, "longest": longest, "active_days": active_days}
+
+
+def random_calendar(rng, days):
+    """A contributionCalendar with Sunday-based weeks and random activity."""
+    end = date(2026, 10, 17)
+    start = end - timedelta(days=days - 1)
+    weeks = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        if not weeks or day.weekday() == 6:
+            weeks.append({"contributionDays": []})
+        count = 0 if rng.random() < rng.choice([0.1, 0.4, 0.8]) else rng.randint(1, 30)
+        weeks[-1]["contributionDays"].append(
+            {"date": day.isoformat(), "contributionCount": count, "color": "#39d353"}
+        )
+    return {"totalContributions": 0, "weeks": weeks}
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_streaks_match_legacy(seed):
+    rng = random.Random(seed)
+    calendar = random_calendar(rng, rng.randint(1, 800))
+    assert calculate_streaks(calendar) == legacy_calculate_streaks(calendar)
+
+
+def test_streaks_treat_missing_days_as_inactive():
+    calendar = random_calendar(random.Random(1), 60)
+    for week in calendar["weeks"][::3]:
+        week["contributionDays"] = week["contributionDays"][1:]
+    assert calculate_streaks(calendar) == legacy_calculate_streaks(calendar)
+
+
+def test_streaks_of_empty_calendar():
+    empty = {"current": 0, "longest": 0, "active_days": 0}
+    assert calculate_streaks({"weeks": []}) == empty
+    assert ContributionCalendar.from_calendar_data(None).streaks() == empty
+
+
+def test_merge_prefers_later_calendars():
+    older = ContributionCalendar.from_dict({"start": 100, "counts": [1, 1, 1]})
+    newer = ContributionCalendar.from_dict({"start": 101, "counts": [5, 0, 7]})
+    merged = ContributionCalendar.merge([older, newer])
+    assert (merged.start, merged.counts.tolist()) == (100, [1, 5, 0, 7])
+
+
+def test_pack_round_trip():
+    calendar = build_sample_contributions("alice")["calendar"]
+    assert unpack_calendar(pack_calendar(calendar)) == calendar
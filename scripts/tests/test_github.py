@@ -0,0 +1,154 @@
+from datetime import date
+
+import pytest
+
+from readme_stats import github
+from readme_stats.contributions import calculate_streaks
+from readme_stats.storage import load_state, save_state
+
+
+def calendar_days(calendar):
+    return [
+        (day["date"], day["contributionCount"])
+        for week in calendar["weeks"]
+        for day in week["contributionDays"]
+    ]
+
+
+@pytest.fixture(params=["year", "full"])
+def history(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(github, "STATE_DIR", str(tmp_path))
+    monkeypatch.setattr(github, "STREAK_HISTORY", request.param)
+    return request.param
+
+
+def assert_matches_full_refresh(stats, history):
+    full = github.fetch_contributions_data("alice", "t")
+    assert calendar_days(stats["calendar"]) == calendar_days(full["calendar"])
+    assert stats["calendar"]["totalContributions"] == full["calendar"]["totalContributions"]
+    assert stats["commits"] == full["commits"]
+    if history == "full":
+        assert stats["streaks"] == stats["history"].streaks()
+    else:
+        assert calculate_streaks(stats["calendar"]) == calculate_streaks(full["calendar"])
+
+
+def test_refresh_matches_full_fetch(github_api, history):
+    first = github.refresh_contributions("alice", "t")
+    assert_matches_full_refresh(first, history)
+
+    before = github_api.counters["graphql"]
+    second = github.refresh_contributions("alice", "t")
+    assert github_api.counters["graphql"] - before == 1  # Only the trailing window
+    assert_matches_full_refresh(second, history)
+
+
+def test_refresh_splices_days_since_checkpoint(github_api, history):
+    github.refresh_contributions("alice", "t")
+    path = github.get_calendar_state_path("alice")
+    state = load_state(path)
+
+    # Roll the stored calendar back ten days, as if the last run was then
+    end = state["start"] + len(state["counts"]) - 1
+    for ordinal in range(end - 9, end + 1):
+        state["counts"][ordinal - state["start"]] = 0
+    state.pop("checkpoint")
+    if history == "full":
+        state["checkpoint"] = github.advance_streaks(state, end - 10)
+    else:
+        state["checkpoint"] = {"ordinal": end - 10}
+    save_state(path, state)
+
+    assert_matches_full_refresh(github.refresh_contributions("alice", "t"), history)
+
+
+def test_refresh_drops_state_from_other_history_mode(github_api, tmp_path, monkeypatch):
+    monkeypatch.setattr(github, "STATE_DIR", str(tmp_path))
+    monkeypatch.setattr(github, "STREAK_HISTORY", "year")
+    github.refresh_contributions("alice", "t")
+
+    monkeypatch.setattr(github, "STREAK_HISTORY", "full")
+    stats = github.refresh_contributions("alice", "t")
+    assert stats["history"].start < date.today().toordinal() - 400
+
+
+def test_year_mode_keeps_only_the_view(github_api, history):
+    github.refresh_contributions("alice", "t")
+    state = load_state(github.get_calendar_state_path("alice"))
+    if history == "year":
+        assert len(state["counts"]) <= 372
+        assert set(state["checkpoint"]) == {"ordinal"}
+    else:
+        assert len(state["counts"]) > 372
+
+
+LANGUAGES = {
+    "u/1": {"Python": 100, "Shell": 10},
+    "u/2": {"Go": 50},
+    "u/3": {"Python": 5, "Rust": 7},
+}
+
+
+def repo(number, pushed_at="2026-01-01T00:00:00Z", **extra):
+    entry = {"id": number, "pushed_at": pushed_at, "languages_url": f"u/{number}", "fork": False}
+    entry.update(extra)
+    return entry
+
+
+def expected_totals(languages):
+    totals = {}
+    for langs in languages:
+        for name, size in langs.items():
+            totals[name] = totals.get(name, 0) + size
+    return totals
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    calls = []
+
+    def fetch(url, token):
+        calls.append(url)
+        return dict(LANGUAGES[url])
+
+    monkeypatch.setattr(github, "fetch_languages_for_repo", fetch)
+    return calls
+
+
+def test_language_state_applies_deltas(lookups):
+    state, fetched = github.update_language_state([repo(1), repo(2), repo(3, fork=True)], "t", None)
+    assert fetched == 2
+    assert state["totals"] == expected_totals([LANGUAGES["u/1"], LANGUAGES["u/2"]])
+
+    # Unchanged repos are not fetched again
+    lookups.clear()
+    state, fetched = github.update_language_state([repo(1), repo(2)], "t", state)
+    assert (fetched, lookups) == (0, [])
+
+    # A push re-fetches that repo, a new repo is added, a deleted one subtracted
+    LANGUAGES["u/1"] = {"Python": 300}
+    try:
+        state, fetched = github.update_language_state(
+            [repo(1, pushed_at="2026-02-01T00:00:00Z"), repo(3)], "t", state
+        )
+    finally:
+        LANGUAGES["u/1"] = {"Python": 100, "Shell": 10}
+    assert sorted(lookups) == ["u/1", "u/3"]
+    assert state["totals"] == expected_totals([{"Python": 300}, LANGUAGES["u/3"]])
+    assert sorted(state["repos"]) == ["1", "3"]
+
+
+def test_language_state_keeps_repos_missing_from_incomplete_listing(lookups):
+    state, _ = github.update_language_state([repo(1), repo(2)], "t", None)
+    state, _ = github.update_language_state([repo(1)], "t", state, listing={"complete": False})
+    assert state["totals"] == expected_totals([LANGUAGES["u/1"], LANGUAGES["u/2"]])
+    assert sorted(state["repos"]) == ["1", "2"]
+
+
+def test_language_state_keeps_counts_when_lookup_fails(lookups, monkeypatch):
+    state, _ = github.update_language_state([repo(1)], "t", None)
+    monkeypatch.setattr(github, "fetch_languages_for_repo", lambda url, token: None)
+    state, _ = github.update_language_state([repo(1, pushed_at="2026-03-01T00:00:00Z")], "t", state)
+    assert state["totals"] == LANGUAGES["u/1"]
+    # The old pushed_at is kept so the next run retries
+    assert state["repos"]["1"]["pushed_at"] == "2026-01-01T00:00:00Z"
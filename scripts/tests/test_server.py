@@ -0,0 +1,124 @@
+import threading
+
+import pytest
+
+from readme_stats import server
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(server, "time", clock)
+    return clock
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def __call__(self, key):
+        self.calls += 1
+        self.started.set()
+        assert self.release.wait(5)
+        return f"{key}-{self.calls}"
+
+
+def test_fresh_entries_are_not_reloaded(clock):
+    loader = Loader()
+    cache = server.CardCache(loader, ttl=10, stale_ttl=100)
+    assert cache.get("alice") == "alice-1"
+    clock.now += 5
+    assert cache.get("alice") == "alice-1"
+    assert loader.calls == 1
+
+
+def test_stale_entry_is_served_during_one_refresh(clock):
+    loader = Loader()
+    cache = server.CardCache(loader, ttl=10, stale_ttl=100)
+    cache.get("alice")
+
+    clock.now += 50
+    loader.release.clear()
+    loader.started.clear()
+    assert cache.get("alice") == "alice-1"
+    assert loader.started.wait(5)
+    # Further requests keep getting the stale value without a second refresh
+    assert cache.get("alice") == "alice-1"
+    assert loader.calls == 2
+
+    loader.release.set()
+    cache._refresher.shutdown(wait=True)
+    assert cache.get("alice") == "alice-2"
+
+
+def test_expired_entry_is_reloaded(clock):
+    loader = Loader()
+    cache = server.CardCache(loader, ttl=10, stale_ttl=100)
+    cache.get("alice")
+    clock.now += 200
+    assert cache.get("alice") == "alice-2"
+
+
+def test_concurrent_misses_share_one_load(clock):
+    loader = Loader()
+    loader.release.clear()
+    cache = server.CardCache(loader, ttl=10, stale_ttl=100)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("alice"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    assert loader.started.wait(5)
+    loader.release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ["alice-1"] * 8
+    assert loader.calls == 1
+
+
+def test_failed_load_is_not_cached(clock):
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        if len(calls) == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    cache = server.CardCache(loader, ttl=10, stale_ttl=100)
+    with pytest.raises(RuntimeError):
+        cache.get("alice")
+    assert cache.get("alice") == "ok"
+
+
+def test_fallback_values_expire_without_stale_window(clock):
+    loader = Loader()
+    cache = server.CardCache(
+        loader, ttl=100, stale_ttl=1000, is_fallback=lambda value: value.endswith("-1"), fallback_ttl=5
+    )
+    assert cache.get("alice") == "alice-1"
+    clock.now += 6
+    # Reloaded synchronously rather than served stale
+    assert cache.get("alice") == "alice-2"
+    clock.now += 50
+    assert cache.get("alice") == "alice-2"
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    loader = Loader()
+    cache = server.CardCache(loader, ttl=10, stale_ttl=100, max_entries=2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")
+    assert list(cache._entries) == ["a", "c"]
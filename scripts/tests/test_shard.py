@@ -0,0 +1,63 @@
+import os
+
+from readme_stats.shard import assign_shard, get_status_path, merge_shards
+from readme_stats.storage import load_state, save_state
+
+LIVE = {"profile": "live", "stats": "live", "languages": "live"}
+
+
+def write_shard(root, index, count, users, state="done"):
+    save_state(get_status_path(root, index, count), {"state": state, "users": users})
+    for name in users:
+        os.makedirs(os.path.join(root, name), exist_ok=True)
+        with open(os.path.join(root, name, "stats.svg"), "w") as f:
+            f.write(f"<svg>{name}</svg>")
+
+
+def test_merge_collects_shards_from_worker_roots(tmp_path):
+    output = str(tmp_path / "merged")
+    first, second = str(tmp_path / "w0"), str(tmp_path / "w1")
+    write_shard(first, 0, 3, {
+        "alice": {"attempts": 1, "cards": 3, "sources": LIVE},
+        "bob": {"attempts": 2, "cards": 3, "sources": dict(LIVE, stats="cached")},
+    })
+    write_shard(second, 1, 3, {"carol": {"attempts": 3, "cards": 3, "sources": LIVE}})
+
+    summary = merge_shards(output, 3, shard_roots=[first, second], usernames=["alice", "bob", "carol", "dave"])
+
+    assert summary["shards"] == {"0": "done", "1": "done", "2": "missing"}
+    assert summary["users"] == 4
+    assert summary["complete"] == 2
+    assert summary["failed"] == ["bob"]
+    assert summary["not_run"] == {"dave": assign_shard("dave", 3)}
+    assert summary["retried"] == {"bob": 2, "carol": 3}
+    assert summary["retry"] == ["bob", "dave"]
+
+    with open(os.path.join(output, "carol", "stats.svg")) as f:
+        assert f.read() == "<svg>carol</svg>"
+    status_dir = os.path.dirname(get_status_path(output, 0, 3))
+    assert load_state(os.path.join(status_dir, "merged.json")) == summary
+    with open(os.path.join(status_dir, "retry-users.txt")) as f:
+        assert f.read() == "bob\ndave\n"
+
+
+def test_merge_prefers_a_finished_copy_of_a_shard(tmp_path):
+    output = str(tmp_path / "merged")
+    stale, done = str(tmp_path / "w0"), str(tmp_path / "w0-rerun")
+    write_shard(stale, 0, 1, {"alice": {"cards": 1, "sources": LIVE}}, state="running")
+    write_shard(done, 0, 1, {"alice": {"cards": 3, "sources": LIVE}})
+
+    summary = merge_shards(output, 1, shard_roots=[done, stale])
+    assert summary["shards"] == {"0": "done"}
+    assert summary["failed"] == []
+
+
+def test_merge_in_place_uses_output_root(tmp_path):
+    root = str(tmp_path)
+    write_shard(root, 0, 2, {"alice": {"cards": 3, "sources": LIVE}})
+    write_shard(root, 1, 2, {"bob": {"cards": 2, "sources": LIVE}}, state="running")
+
+    summary = merge_shards(root, 2)
+    assert summary["shards"] == {"0": "done", "1": "running"}
+    assert summary["failed"] == ["bob"]
+    assert summary["not_run"] == {}